@@ -5,20 +5,42 @@
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.parse import quote, urljoin
-from bs4 import BeautifulSoup
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import quote, urljoin, urlsplit
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from functools import cached_property, lru_cache
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional
+from datetime import datetime
+import soupsieve as sv
 import requests
+import contextvars
+import cProfile
+import pstats
+import traceback
+import uuid
+import io
+import sys
+import unicodedata
+from array import array
 import random
+import math
 import sqlite3
+import gzip
+import zlib
+import struct
 import hashlib
 import json
 import time
+import threading
+import queue
+import heapq
 import logging
 import os
 import re
@@ -29,9 +51,86 @@ import re
 
 PORT = int(os.environ.get('PORT', 5000))
 DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
-CACHE_TTL_MINUTES = 60  # Caché por 1 hora
-MAX_WORKERS = 4  # Búsquedas en paralelo
+CACHE_TTL_MINUTES = 60  # Caché fresco por 1 hora (soft TTL)
+CACHE_STALE_TTL_MINUTES = 24 * 60  # Después se sirve viejo mientras se refresca (hard TTL)
+L1_MAX_ENTRIES = 256  # Caché en memoria por worker
+L1_MAX_BYTES = 32 * 1024 * 1024
+ENTRY_VIEWS = 8  # Vistas (página/campos) serializadas y comprimidas que guarda cada entrada
+CACHE_EXPIRY_INTERVAL_SECONDS = 60  # Cada cuánto se purga un lote de entradas vencidas
+CACHE_EXPIRY_BATCH = 500
+MAX_WORKERS = int(os.environ.get('SCRAPE_POOL_SIZE', 16))  # Hilos de scraping compartidos por el proceso
 REQUEST_TIMEOUT = 15
+SEARCH_DEADLINE_SECONDS = 30  # Presupuesto total de una búsqueda (reintentos incluidos)
+SEARCH_MIN_SECONDS = 5  # Con menos presupuesto restante no se empieza un scrape: 504
+MAX_PAGES = 3  # Páginas por (fuente, keyword)
+PAGE_WINDOW = 2  # Páginas que se piden a la vez después de la primera
+PAGINATION_SECONDS = 12  # Las páginas 2+ deben terminar dentro de este margen de la búsqueda
+DEDUP_BANDS = 16  # LSH: bandas × filas = permutaciones MinHash por vacante
+DEDUP_ROWS = 4
+DEDUP_SIMILARITY = 0.7  # Fracción de la firma que debe coincidir para ser duplicado
+INDEX_BACKFILL_BATCH = 200  # Vacantes sin cluster (índices anteriores) que se agrupan por ingesta
+# Ranking: pesos por defecto (RANK_WEIGHTS="keywords=0.5,location=0.3,recency=0.2" los cambia)
+DEFAULT_RANK_WEIGHTS = {'keywords': 0.6, 'location': 0.25, 'recency': 0.15}
+RANK_RECENCY_HALF_LIFE_HOURS = 72  # La recencia de una vacante cae a la mitad cada 3 días
+RANK_REMOTE_SCORE = 0.6  # Puntaje de ubicación de las vacantes remotas
+BROADER_MIN_JOBS = 5  # Mínimo de vacantes para servir una ciudad filtrando el caché de su estado/país
+METRICS_FLUSH_SECONDS = 5  # Cada cuánto vuelca cada worker sus métricas al SQLite compartido
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 0.01))  # Peticiones cuya traza va al log
+TRACE_SLOW_SECONDS = float(os.environ.get('TRACE_SLOW_SECONDS', 10))  # Más lentas: traza y volcado de pilas
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # Peticiones que corren con cProfile
+BATCH_MAX_SEARCHES = 40  # Pares (carrera, ubicación) por petición a /api/scrape/batch
+BATCH_CONCURRENCY = 4  # Búsquedas de un lote que orquestan a la vez (las descargas van al pool de scraping)
+SSE_KEEPALIVE_SECONDS = 15  # Comentario periódico para que proxies no corten el stream
+PARTIAL_CACHE_TTL_MINUTES = 5  # Resultados parciales se refrescan pronto
+BREAKER_FAILURE_THRESHOLD = 3  # Fallos/vacíos seguidos para abrir el circuito de una fuente
+BREAKER_COOLDOWN_SECONDS = 120  # Tiempo con el circuito abierto antes de probar de nuevo
+ADAPTIVE_TIMEOUT_MIN = 3  # Segundos; el timeout adaptativo nunca baja de aquí
+ADAPTIVE_TIMEOUT_FACTOR = 2.0  # Timeout = p95 observado × factor (tope REQUEST_TIMEOUT)
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 10))  # Conexiones por host
+HTTP_POOL_SIZES = {
+    'www.linkedin.com': 8,
+    'mx.indeed.com': 8,
+}
+# Límite por fuente: (peticiones por segundo, ráfaga)
+SOURCE_RATE_LIMITS = {
+    'www.linkedin.com': (0.5, 3),
+    'mx.indeed.com': (0.5, 3),
+    'www.computrabajo.com.mx': (1.0, 4),
+    'www.occ.com.mx': (1.0, 4),
+}
+DEFAULT_RATE_LIMIT = (2.0, 5)
+# Bytes máximos que se leen de una página por fuente (el resto se descarta)
+SOURCE_MAX_BYTES = {
+    'www.linkedin.com': 1_500_000,
+    'mx.indeed.com': 3_000_000,
+    'www.computrabajo.com.mx': 1_500_000,
+    'www.occ.com.mx': 2_000_000,
+}
+DEFAULT_MAX_BYTES = 2_000_000
+HTTP_CHUNK_BYTES = 64 * 1024  # Bloques de la descarga en streaming
+CARD_GAP_BYTES = 64 * 1024  # Tanto HTML sin otra tarjeta después de la última = fin de resultados
+# Solo pruebas de carga: todas las fuentes se piden a este servidor local
+# como {UPSTREAM_BASE_URL}/{host}/{ruta} (ver bench/fake_sites.py), sin proxies
+UPSTREAM_BASE_URL = os.environ.get('UPSTREAM_BASE_URL', '').rstrip('/')
+RATE_LIMIT_MAX_WAIT = 10  # Máximo que una petición espera su turno
+RETRY_AFTER_MAX_WAIT = 5  # Un Retry-After mayor abandona la petición en vez de dormir
+SINGLE_FLIGHT_LEASE_SECONDS = 45  # Menor que el --timeout 60 de gunicorn: nadie espera a un worker ya muerto
+SINGLE_FLIGHT_POLL_SECONDS = 0.5  # Cada cuánto revisa el caché un worker que espera a otro
+PREWARM_ENABLED = os.environ.get('PREWARM_ENABLED', 'true').lower() == 'true'
+PREWARM_INTERVAL_SECONDS = 60  # Ciclo del scheduler de pre-calentamiento
+PREWARM_LEAD_SECONDS = 5 * 60  # Se refresca lo que vence (soft TTL) dentro de este margen
+PREWARM_MAX_PER_CYCLE = 4  # Tope de refrescos por ciclo; cada uno pide hasta keywords × MAX_PAGES páginas a cada fuente
+PREWARM_RATE_SHARE = 0.5  # Fracción del límite de la fuente más lenta que puede gastar el pre-calentamiento
+PREWARM_TOP_KEYS = 40  # Claves más pedidas que se consideran
+PREWARM_MIN_SCORE = 3  # Peticiones recientes (con decaimiento) para contar como caliente
+DEMAND_HALF_LIFE_HOURS = 24  # Vida media de los conteos de demanda
+# Búsquedas asíncronas: 'local' = pool en cada worker web, 'external' = `python app.py worker`
+SEARCH_JOBS_MODE = os.environ.get('SEARCH_JOBS_MODE', 'local')
+SEARCH_JOB_WORKERS = int(os.environ.get('SEARCH_JOB_WORKERS', 4))  # Búsquedas simultáneas por proceso
+SEARCH_JOB_STALE_SECONDS = 120  # Un trabajo sin avance por más tiempo se da por abandonado
+SEARCH_JOB_HEARTBEAT_SECONDS = 30  # Cada cuánto renueva updated_at el proceso que corre un trabajo
+SEARCH_JOB_RETENTION_SECONDS = 3600  # Los trabajos terminados se consultan hasta por una hora
+SEARCH_JOB_POLL_SECONDS = 0.5  # Sondeo de la cola (worker) y del estado (SSE)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +146,386 @@ logger = logging.getLogger('JobScout')
 app = Flask(__name__, static_folder='static', static_url_path='')
 CORS(app)
 
+# ══════════════════════════════════════════════════════════════════════════════
+# MÉTRICAS - Formato Prometheus, agregadas entre workers de gunicorn
+# ══════════════════════════════════════════════════════════════════════════════
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30, 60)
+
+
+class Metrics:
+    """Contadores, gauges e histogramas del proceso.
+    
+    Cada worker vuelca sus series cada METRICS_FLUSH_SECONDS a un SQLite
+    compartido (una fila por worker y serie); `/api/metrics` suma las de
+    todos. Los contadores e histogramas de workers muertos se conservan
+    para que los totales no retrocedan; los gauges solo cuentan workers vivos.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._defs: Dict[str, tuple] = {}  # nombre -> (tipo, ayuda, buckets)
+        self._series: Dict[tuple, object] = {}  # (nombre, labels) -> valor
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = None
+        self._worker_id = None
+        self._flusher = None
+    
+    # ── Definición ────────────────────────────────────────────────────────────
+    
+    def counter(self, name: str, help_text: str):
+        self._defs[name] = ('counter', help_text, None)
+    
+    def gauge(self, name: str, help_text: str):
+        self._defs[name] = ('gauge', help_text, None)
+    
+    def histogram(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self._defs[name] = ('histogram', help_text, tuple(buckets))
+    
+    # ── Registro ──────────────────────────────────────────────────────────────
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            self._series[key] = self._series.get(key, 0) + value
+        self._start_flusher()
+    
+    def observe(self, name: str, value: float, **labels):
+        buckets = self._defs[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            series = self._series.get(key)
+            if series is None:
+                # Conteo por bucket (no acumulado), luego suma y total
+                series = self._series[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+        self._start_flusher()
+    
+    @contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def _check_fork(self):
+        # Tras un fork (gunicorn --preload) el hijo empieza de cero con id propio
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._worker_id = f"{self._pid}-{int(time.time() * 1000)}"
+            self._series = {}
+            self._flusher = None
+    
+    # ── Persistencia compartida ───────────────────────────────────────────────
+    
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS metrics (
+                    worker TEXT,
+                    name TEXT,
+                    labels TEXT,
+                    value TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (worker, name, labels)
+                )
+            ''')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def _start_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+                self._flusher.start()
+    
+    def _flush_loop(self):
+        while True:
+            time.sleep(METRICS_FLUSH_SECONDS)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ Error guardando métricas: {str(e)[:50]}")
+    
+    def flush(self):
+        with self._lock:
+            self._check_fork()
+            worker = self._worker_id
+            rows = [(name, json.dumps(labels), json.dumps(value)) for (name, labels), value in self._series.items()]
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO metrics (worker, name, labels, value, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(worker, name, labels, value, now) for name, labels, value in rows]
+            )
+            # Latido del worker aunque no tenga series, para los gauges
+            conn.execute(
+                'INSERT OR REPLACE INTO metrics (worker, name, labels, value, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (worker, '_heartbeat', '[]', '0', now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def collect(self) -> Dict[tuple, object]:
+        """Series de todos los workers, sumadas"""
+        self.flush()
+        alive_after = time.time() - 3 * METRICS_FLUSH_SECONDS
+        totals: Dict[tuple, object] = {}
+        for name, labels, value, updated_at in self._conn().execute(
+            'SELECT name, labels, value, updated_at FROM metrics'
+        ):
+            definition = self._defs.get(name)
+            if definition is None:
+                continue
+            if definition[0] == 'gauge' and updated_at < alive_after:
+                continue
+            key = (name, tuple(tuple(pair) for pair in json.loads(labels)))
+            value = json.loads(value)
+            if definition[0] == 'histogram':
+                current = totals.get(key)
+                totals[key] = value if current is None else [a + b for a, b in zip(current, value)]
+            else:
+                totals[key] = totals.get(key, 0) + value
+        return totals
+    
+    def render(self) -> str:
+        """Texto en formato de exposición de Prometheus"""
+        totals = self.collect()
+        
+        # Derivada: tasa de aciertos del caché (todo lo que no fue miss sobre el total)
+        lookups = {dict(labels).get('result'): value for (name, labels), value in totals.items()
+                   if name == 'jobscout_cache_requests_total'}
+        if lookups:
+            total = sum(lookups.values())
+            totals[('jobscout_cache_hit_ratio', ())] = (total - lookups.get('miss', 0)) / total
+        
+        lines = []
+        for name, (kind, help_text, buckets) in self._defs.items():
+            series = sorted((labels, value) for (n, labels), value in totals.items() if n == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets, value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {value[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        f'{k}="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for k, v in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = Metrics(os.environ.get('METRICS_DB_PATH', 'jobscout_metrics.db'))
+metrics.histogram('jobscout_search_seconds', 'Duración de búsquedas en vivo (scrape de todas las fuentes)')
+metrics.histogram('jobscout_source_seconds', 'Duración de cada scraper por fuente')
+metrics.histogram('jobscout_http_request_seconds', 'Duración de cada petición HTTP por host')
+metrics.histogram('jobscout_parse_seconds', 'Duración del parseo HTML por fuente')
+metrics.counter('jobscout_http_requests_total', 'Respuestas HTTP por host y status')
+metrics.counter('jobscout_http_retries_total', 'Reintentos de SmartHTTPClient.get por host')
+metrics.counter('jobscout_http_429_total', 'Respuestas 429/503 (rate limit) por host')
+metrics.counter('jobscout_http_timeouts_total', 'Timeouts de petición por host')
+metrics.counter('jobscout_http_proxy_errors_total', 'Errores de proxy por host')
+metrics.counter('jobscout_http_errors_total', 'Otros errores de conexión por host')
+metrics.counter('jobscout_http_deferred_total', 'Tareas de scraping reprogramadas en vez de dormir esperando turno, por host')
+metrics.counter('jobscout_cache_requests_total', 'Consultas al caché por resultado (hit, stale, broader, miss)')
+metrics.gauge('jobscout_cache_hit_ratio', 'Fracción de consultas servidas desde caché (fresco, viejo o filtrado)')
+metrics.counter('jobscout_listings_parsed_total', 'Vacantes extraídas por fuente')
+metrics.counter('jobscout_http_truncated_total', 'Descargas cortadas por host: budget (tope de bytes) o cards (fin de tarjetas)')
+metrics.counter('jobscout_pages_total', 'Páginas de resultados por fuente: parsed, not_modified (304) o unchanged (mismo hash)')
+metrics.gauge('jobscout_searches_in_flight', 'Búsquedas en vivo en curso')
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TRAZAS - Desglose de tiempo por etapa de cada petición
+# ══════════════════════════════════════════════════════════════════════════════
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('trace', default=None)
+
+
+class Trace:
+    """Spans de una petición. Los hilos del pool de scraping la heredan vía contextvars."""
+    
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.started = time.perf_counter()
+        self.spans: List[tuple] = []  # (nombre, inicio, duración, atributos)
+        self.open: Dict[int, List[str]] = {}  # hilo -> spans abiertos, para volcar pilas
+        self.dumped = False
+        self._lock = threading.Lock()
+    
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+    
+    @contextmanager
+    def span(self, name: str, **attrs):
+        ident = threading.get_ident()
+        started = time.perf_counter()
+        with self._lock:
+            self.open.setdefault(ident, []).append(name)
+        try:
+            yield attrs
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                stack = self.open[ident]
+                stack.pop()
+                if not stack:
+                    del self.open[ident]
+                self.spans.append((name, started - self.started, duration, attrs))
+    
+    def breakdown(self) -> Dict:
+        """Total por etapa (tiempo acumulado, los hilos en paralelo suman) y la lista de spans"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s[1])
+        stages: Dict[str, float] = {}
+        for name, _, duration, _ in spans:
+            stages[name] = stages.get(name, 0) + duration
+        return {
+            'trace_id': self.trace_id,
+            'total_ms': round(self.elapsed * 1000, 1),
+            'stages_ms': {name: round(total * 1000, 1)
+                          for name, total in sorted(stages.items(), key=lambda s: -s[1])},
+            'spans': [
+                {'name': name, 'start_ms': round(start * 1000, 1), 'duration_ms': round(duration * 1000, 1), **attrs}
+                for name, start, duration, attrs in spans
+            ]
+        }
+    
+    def dump_stacks(self) -> str:
+        """Pila actual de cada hilo que trabaja para esta petición"""
+        frames = sys._current_frames()
+        with self._lock:
+            busy = {ident: ' > '.join(stack) for ident, stack in self.open.items()}
+        return '\n'.join(
+            f"── hilo {ident} ({where})\n" + ''.join(traceback.format_stack(frames[ident]))
+            for ident, where in busy.items() if ident in frames
+        )
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Span dentro de la traza activa; sin traza no mide nada"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield attrs
+        return
+    with trace.span(name, **attrs) as span_attrs:
+        yield span_attrs
+
+
+class SlowTraceWatchdog:
+    """Vuelca las pilas de las peticiones que pasan de TRACE_SLOW_SECONDS, mientras siguen en curso"""
+    
+    def __init__(self):
+        self._traces = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+    
+    def add(self, trace: Trace):
+        with self._lock:
+            self._traces.add(trace)
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='trace-watchdog', daemon=True)
+                self._thread.start()
+    
+    def discard(self, trace: Trace):
+        with self._lock:
+            self._traces.discard(trace)
+    
+    def _run(self):
+        while True:
+            time.sleep(1)
+            with self._lock:
+                slow = [t for t in self._traces if not t.dumped and t.elapsed >= TRACE_SLOW_SECONDS]
+            for trace in slow:
+                trace.dumped = True
+                logger.warning(
+                    f"🐢 {trace.name} {trace.trace_id} lleva {trace.elapsed:.0f}s "
+                    f"{json.dumps(trace.attrs, ensure_ascii=False)}\n{trace.dump_stacks()}"
+                )
+
+trace_watchdog = SlowTraceWatchdog()
+
+
+@contextmanager
+def tracing(name: str, **attrs):
+    """Traza una petición completa.
+    
+    Se registra como log estructurado si cae en la muestra (TRACE_SAMPLE_RATE) o
+    si resulta lenta; una muestra aparte (PROFILE_SAMPLE_RATE) corre con cProfile
+    en el hilo de la petición.
+    """
+    trace = Trace(name, **attrs)
+    sampled = random.random() < TRACE_SAMPLE_RATE
+    profiler = None
+    if random.random() < PROFILE_SAMPLE_RATE:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Solo un perfilador activo a la vez por intérprete
+            profiler = None
+    
+    token = _current_trace.set(trace)
+    trace_watchdog.add(trace)
+    try:
+        yield trace
+    finally:
+        if profiler:
+            profiler.disable()
+        _current_trace.reset(token)
+        trace_watchdog.discard(trace)
+        
+        if sampled or trace.elapsed >= TRACE_SLOW_SECONDS:
+            logger.info(f"🧭 {json.dumps({'trace': name, **attrs, **trace.breakdown()}, ensure_ascii=False)}")
+        if profiler:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(25)
+            logger.info(f"🔬 Perfil {name} {trace.trace_id}:\n{out.getvalue()}")
+
 # ══════════════════════════════════════════════════════════════════════════════
 # USER AGENTS REALISTAS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -69,11 +548,43 @@ USER_AGENTS = [
 # PROXY MANAGER - Proxies gratuitos rotativos
 # ══════════════════════════════════════════════════════════════════════════════
 
+class ProxyHealth:
+    """Salud de un proxy: latencia (EWMA) y tasa de éxito"""
+    
+    def __init__(self):
+        self.latency = None  # Segundos, promedio móvil exponencial
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+    
+    def record(self, ok: bool, latency: float):
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+    
+    @property
+    def score(self) -> float:
+        # Suavizado de Laplace: un proxy nuevo arranca con 50% de éxito
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        latency = self.latency if self.latency is not None else REQUEST_TIMEOUT / 3
+        return success_rate / max(latency, 0.05)
+
+
 class ProxyManager:
     def __init__(self):
-        self.proxies = []
+        self.proxies: Dict[str, ProxyHealth] = {}
+        self.evicted: Dict[str, float] = {}  # proxy -> epoch de expulsión
         self.last_fetch = None
         self.fetch_interval = 300  # Refrescar cada 5 minutos
+        self.max_failures = 3  # Fallos seguidos antes de expulsar un proxy
+        self.eviction_seconds = 3600  # Un proxy expulsado no vuelve en 1 hora
+        self.top_k = 5  # Se elige al azar entre los K mejores para repartir carga
+        self._lock = threading.Lock()
+        self._thread = None
     
     def fetch_proxies(self):
         """Obtiene proxies gratuitos de múltiples fuentes"""
@@ -97,27 +608,72 @@ class ProxyManager:
                 continue
         
         if new_proxies:
-            self.proxies = list(set(new_proxies))[:100]  # Max 100 proxies
-            self.last_fetch = datetime.now()
+            now = time.time()
+            with self._lock:
+                self.evicted = {p: t for p, t in self.evicted.items() if now - t < self.eviction_seconds}
+                fresh = [p for p in dict.fromkeys(new_proxies) if p not in self.evicted]
+                # Conservar la salud medida de los proxies que siguen en la lista
+                self.proxies = {p: self.proxies.get(p) or ProxyHealth() for p in fresh[:100]}  # Max 100 proxies
+                self.last_fetch = datetime.now()
             logger.info(f"🔄 {len(self.proxies)} proxies cargados")
         
-        return self.proxies
+        return list(self.proxies)
+    
+    def start(self):
+        """Arranca el refresco en segundo plano (una vez por proceso)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._refresh_loop, name='proxy-refresh', daemon=True)
+            self._thread.start()
+    
+    def _refresh_loop(self):
+        while True:
+            if not self.proxies or not self.last_fetch or \
+               (datetime.now() - self.last_fetch).total_seconds() > self.fetch_interval:
+                try:
+                    self.fetch_proxies()
+                except Exception as e:
+                    logger.warning(f"⚠️ Error refrescando proxies: {str(e)[:50]}")
+            time.sleep(30)
     
     def get_proxy(self) -> Optional[Dict]:
-        """Retorna un proxy aleatorio o None para usar conexión directa"""
+        """Retorna uno de los proxies más sanos o None para usar conexión directa"""
+        # Nunca bloquea: si la lista aún no carga, se usa conexión directa
+        self.start()
+        
         # 50% de probabilidad de usar proxy, 50% directo
         if random.random() > 0.5:
             return None
         
-        # Refrescar si es necesario
-        if not self.proxies or not self.last_fetch or \
-           (datetime.now() - self.last_fetch).seconds > self.fetch_interval:
-            self.fetch_proxies()
-        
-        if self.proxies:
-            proxy = random.choice(self.proxies)
-            return {'http': proxy, 'https': proxy}
-        return None
+        with self._lock:
+            if not self.proxies:
+                return None
+            ranked = sorted(self.proxies.items(), key=lambda item: item[1].score, reverse=True)
+            proxy = random.choice(ranked[:self.top_k])[0]
+        return {'http': proxy, 'https': proxy}
+    
+    def record(self, proxy: str, ok: bool, latency: float):
+        """Registra el resultado de una petición hecha a través de `proxy`"""
+        with self._lock:
+            health = self.proxies.get(proxy)
+            if health is None:
+                return
+            health.record(ok, latency)
+            if health.consecutive_failures >= self.max_failures:
+                del self.proxies[proxy]
+                self.evicted[proxy] = time.time()
+                logger.info(f"🚫 Proxy expulsado: {proxy}")
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            healthy = [h for h in self.proxies.values() if h.successes]
+            return {
+                'loaded': len(self.proxies),
+                'healthy': len(healthy),
+                'evicted': len(self.evicted),
+                'last_fetch': self.last_fetch.isoformat() if self.last_fetch else None,
+            }
 
 proxy_manager = ProxyManager()
 
@@ -125,149 +681,1217 @@ proxy_manager = ProxyManager()
 # CACHÉ SQLite
 # ══════════════════════════════════════════════════════════════════════════════
 
+@dataclass
+class CacheEntry:
+    payload: bytes  # JSON de la lista de vacantes, listo para enviar
+    created_at: float  # Epoch
+    stale_at: float
+    expires_at: float
+    total: int
+    compressed: Optional[bytes] = None  # Payload en gzip (el mismo BLOB de SQLite)
+    # Por vista: JSON de las vacantes y su deflate para respuestas gzip (vista '' = lista completa)
+    views: Dict[str, bytes] = field(default_factory=dict, repr=False, compare=False)
+    segments: Dict[str, bytes] = field(default_factory=dict, repr=False, compare=False)
+    # Lo agregado después de guardarla (gzip, vistas) se avisa al L1 que la contiene
+    on_grow: Optional[Callable[['CacheEntry'], None]] = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    @classmethod
+    def from_data(cls, data: List, soft_ttl: Optional[float] = None) -> 'CacheEntry':
+        now = time.time()
+        return cls(
+            payload=json.dumps(data).encode(),
+            created_at=now,
+            stale_at=now + (soft_ttl if soft_ttl is not None else CACHE_TTL_MINUTES * 60),
+            expires_at=now + CACHE_STALE_TTL_MINUTES * 60,
+            total=len(data)
+        )
+    
+    def derive(self, data: List) -> 'CacheEntry':
+        """Otra lista de vacantes con la misma vigencia que esta entrada"""
+        return CacheEntry(
+            payload=json.dumps(data).encode(),
+            created_at=self.created_at,
+            stale_at=self.stale_at,
+            expires_at=self.expires_at,
+            total=len(data)
+        )
+    
+    @cached_property
+    def data(self) -> List:
+        return json.loads(self.payload)
+    
+    @cached_property
+    def etag(self) -> str:
+        return hashlib.blake2b(self.payload, digest_size=12).hexdigest()
+    
+    @property
+    def gzipped(self) -> bytes:
+        """Payload como un miembro gzip, comprimido una sola vez por entrada"""
+        if self.compressed is None:
+            compressed = gzip.compress(self.payload, compresslevel=6, mtime=0)
+            with self._lock:
+                if self.compressed is None:
+                    self.compressed = compressed
+            self._grew()
+        return self.compressed
+    
+    @property
+    def size(self) -> int:
+        """Bytes en memoria: payload, gzip y las vistas con sus segmentos"""
+        with self._lock:
+            return (len(self.payload) + len(self.compressed or b'')
+                    + sum(map(len, self.views.values())) + sum(map(len, self.segments.values())))
+    
+    def view_payload(self, tag: str, build) -> bytes:
+        """JSON de una vista de la lista (`build()` lo genera), serializado una vez por entrada"""
+        if not tag:
+            return self.payload
+        with self._lock:
+            payload = self.views.get(tag)
+        if payload is not None:
+            return payload
+        payload = build()
+        with self._lock:
+            if tag not in self.views:
+                if len(self.views) >= ENTRY_VIEWS:
+                    oldest = next(iter(self.views))
+                    self.views.pop(oldest, None)
+                    self.segments.pop(oldest, None)
+                self.views[tag] = payload
+        self._grew()
+        return payload
+    
+    def segment(self, tag: str, payload: bytes) -> bytes:
+        """Deflate del JSON de la vista `tag`, comprimido una vez y empalmable en un miembro gzip"""
+        with self._lock:
+            segment = self.segments.get(tag)
+        if segment is not None:
+            return segment
+        segment = deflate_segment(payload)
+        with self._lock:
+            # La vista pudo salir entre tanto; su segmento no se guarda sin ella
+            if tag in self.views or not tag:
+                segment = self.segments.setdefault(tag, segment)
+        self._grew()
+        return segment
+    
+    def _grew(self):
+        if self.on_grow is not None:
+            self.on_grow(self)
+    
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.created_at
+    
+    @property
+    def stale(self) -> bool:
+        """Pasó el soft TTL: se puede servir, pero hay que refrescarla"""
+        return time.time() >= self.stale_at
+    
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'  # Sin nombre ni mtime, SO desconocido
+
+def deflate_segment(data: bytes, level: int = 6) -> bytes:
+    """Deflate crudo cerrado con sync flush (sin bloque final): se puede empalmar
+    con otros segmentos dentro de un mismo miembro gzip"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+def gzip_member(parts: List[tuple]) -> bytes:
+    """Un solo miembro gzip con las partes (datos, segmento ya comprimido o None) en orden"""
+    chunks, crc, size = [GZIP_HEADER], 0, 0
+    for data, segment in parts:
+        chunks.append(segment if segment is not None else deflate_segment(data, level=1))
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+    finish = zlib.compressobj(1, zlib.DEFLATED, -15)
+    chunks.append(finish.flush())  # Bloque final vacío
+    chunks.append(struct.pack('<II', crc, size & 0xFFFFFFFF))
+    return b''.join(chunks)
+
+
+@dataclass
+class StoredPage:
+    """Lo último que devolvió una URL de resultados, para no volver a descargarla ni parsearla"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    listings: bytes  # JSON en gzip de las vacantes parseadas, sin ubicación si la tarjeta no trae
+    
+    def jobs(self, location: str) -> List['JobListing']:
+        """Las vacantes guardadas; las que no traen ubicación toman la de esta búsqueda"""
+        return [JobListing(**{**job, 'location': job['location'] or location})
+                for job in json.loads(gzip.decompress(self.listings))]
+
+
+class MemoryLRU:
+    """Caché L1 en memoria, acotado por número de entradas y por bytes"""
+    
+    def __init__(self, max_entries: int = L1_MAX_ENTRIES, max_bytes: int = L1_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}  # Bytes contados de cada entrada (ver CacheEntry.size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key: str, entry: CacheEntry):
+        size = entry.size
+        if size > self.max_bytes:
+            return
+        entry.on_grow = lambda grown: self.resize(key, grown)
+        with self._lock:
+            self._remove(key)
+            self._items[key] = entry
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+    
+    def resize(self, key: str, entry: CacheEntry):
+        """La entrada creció (gzip o vistas agregadas): se re-cuenta y se desaloja si hace falta"""
+        size = entry.size
+        with self._lock:
+            if self._items.get(key) is not entry:
+                return
+            self._bytes += size - self._sizes[key]
+            self._sizes[key] = size
+            self._evict()
+    
+    def _evict(self):
+        while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._items))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def invalidate(self, key: str):
+        with self._lock:
+            self._remove(key)
+    
+    def prune(self):
+        """Quita las entradas que ya pasaron el hard TTL"""
+        with self._lock:
+            for key in [k for k, e in self._items.items() if e.expired]:
+                self._remove(key)
+    
+    def _remove(self, key: str):
+        if self._items.pop(key, None) is not None:
+            self._bytes -= self._sizes.pop(key)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
 class CacheDB:
+    """Caché SQLite compartido entre workers.
+    
+    Una conexión persistente por hilo en modo WAL (lectores y escritor no se
+    bloquean entre sí), tiempos como epoch enteros con índice en `expires_at`
+    y payloads comprimidos con gzip en BLOB. Las entradas vencidas se borran
+    por lotes pequeños desde `set()` en lugar de en cada lectura.
+    """
+    
+    SCHEMA_VERSION = 3
+    
     def __init__(self, db_path='jobscout_cache.db'):
         self.db_path = db_path
+        self.memory = MemoryLRU()
+        self._local = threading.local()
+        self._next_expiry = 0.0
         self._init_db()
     
+    def _conn(self) -> sqlite3.Connection:
+        """Conexión del hilo actual (se recrea tras un fork de gunicorn)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=10000')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS cache (
-                    key TEXT PRIMARY KEY,
-                    data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_created ON cache(created_at)')
-            conn.commit()
+        conn = self._conn()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < 2:
+            # Esquema anterior (ISO text + JSON plano): es caché, se descarta
+            conn.execute('DROP TABLE IF EXISTS cache')
+        if version < 3:
+            # Páginas guardadas con la ubicación de la primera búsqueda en las tarjetas sin ubicación
+            conn.execute('DROP TABLE IF EXISTS pages')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                total INTEGER NOT NULL,
+                created_at INTEGER NOT NULL,
+                stale_at INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_expires ON cache(expires_at)')
+        # Leases de single-flight compartidos entre workers de gunicorn
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                owner TEXT,
+                expires_at REAL
+            )
+        ''')
+        # Última versión de cada página de resultados: validadores HTTP, hash y vacantes
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                listings BLOB,
+                checked_at INTEGER
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_checked ON pages(checked_at)')
+        # Cola de búsquedas asíncronas
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_jobs (
+                id TEXT PRIMARY KEY,
+                career TEXT,
+                location TEXT,
+                status TEXT,
+                owner TEXT,
+                created_at REAL,
+                updated_at REAL,
+                finished_at REAL,
+                summary TEXT,
+                error TEXT
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_search_jobs_status ON search_jobs(status, created_at)')
+        # Demanda por (carrera, ubicación) con decaimiento, para el pre-calentamiento
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS demand (
+                career TEXT,
+                location TEXT,
+                score REAL,
+                updated_at REAL,
+                PRIMARY KEY (career, location)
+            )
+        ''')
+        conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
     
     def _generate_key(self, *args) -> str:
         key_data = json.dumps(args, sort_keys=True)
         return hashlib.md5(key_data.encode()).hexdigest()
     
     def get(self, *args) -> Optional[List]:
+        """Solo entradas frescas (dentro del soft TTL)"""
+        entry = self.get_entry(*args, allow_stale=False)
+        return entry.data if entry else None
+    
+    def get_entry(self, *args, allow_stale: bool = True) -> Optional[CacheEntry]:
+        """Entrada fresca o vieja; las que pasaron el hard TTL no se devuelven"""
         key = self._generate_key(*args)
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                'SELECT data, created_at FROM cache WHERE key = ?', (key,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                data, created_at = row
-                created = datetime.fromisoformat(created_at)
-                if datetime.now() - created < timedelta(minutes=CACHE_TTL_MINUTES):
-                    logger.info(f"💾 Cache HIT: {key[:8]}...")
-                    return json.loads(data)
-                else:
-                    # Expirado, eliminar
-                    conn.execute('DELETE FROM cache WHERE key = ?', (key,))
-                    conn.commit()
-        return None
+        
+        # L1: las entradas frescas se sirven sin tocar disco ni parsear JSON.
+        # Las viejas se vuelven a leer de SQLite, donde otro worker pudo refrescarlas.
+        entry = self.memory.get(key)
+        if entry and not entry.stale:
+            return entry
+        
+        entry = self._load(key)
+        if entry is None:
+            self.memory.invalidate(key)
+            return None
+        self.memory.put(key, entry)
+        if entry.stale and not allow_stale:
+            return None
+        return entry
+    
+    def get_many(self, keys: List[tuple], allow_stale: bool = True) -> Dict[tuple, CacheEntry]:
+        """Como `get_entry` para varias claves; lo que no está fresco en L1 sale de una sola consulta"""
+        found = {}
+        pending = {}
+        for args in keys:
+            key = self._generate_key(*args)
+            entry = self.memory.get(key)
+            if entry and not entry.stale:
+                found[args] = entry
+            else:
+                pending[key] = args
+        if not pending:
+            return found
+        
+        rows = self._conn().execute(
+            'SELECT key, payload, total, created_at, stale_at, expires_at FROM cache '
+            f'WHERE key IN ({", ".join("?" * len(pending))}) AND expires_at > ?',
+            (*pending, int(time.time()))
+        ).fetchall()
+        loaded = {row[0]: self._entry(row[0], row[1:]) for row in rows}
+        for key, args in pending.items():
+            entry = loaded.get(key)
+            if entry is None:
+                self.memory.invalidate(key)
+                continue
+            self.memory.put(key, entry)
+            if allow_stale or not entry.stale:
+                found[args] = entry
+        return found
     
-    def set(self, data: List, *args):
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn().execute(
+            'SELECT payload, total, created_at, stale_at, expires_at FROM cache '
+            'WHERE key = ? AND expires_at > ?',
+            (key, int(time.time()))
+        ).fetchone()
+        return self._entry(key, row) if row else None
+    
+    @staticmethod
+    def _entry(key: str, row: tuple) -> CacheEntry:
+        payload, total, created_at, stale_at, expires_at = row
+        entry = CacheEntry(
+            payload=gzip.decompress(payload),
+            created_at=created_at,
+            stale_at=stale_at,
+            expires_at=expires_at,
+            total=total,
+            compressed=payload
+        )
+        logger.info(f"💾 Cache {'STALE' if entry.stale else 'HIT'}: {key[:8]}...")
+        return entry
+    
+    def set(self, data: List, *args, soft_ttl: Optional[float] = None) -> CacheEntry:
         key = self._generate_key(*args)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                'INSERT OR REPLACE INTO cache (key, data, created_at) VALUES (?, ?, ?)',
-                (key, json.dumps(data), datetime.now().isoformat())
-            )
-            conn.commit()
+        entry = CacheEntry.from_data(data, soft_ttl=soft_ttl)
+        self._conn().execute(
+            'INSERT OR REPLACE INTO cache (key, payload, total, created_at, stale_at, expires_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (key, entry.gzipped, entry.total,
+             int(entry.created_at), int(entry.stale_at), int(entry.expires_at))
+        )
+        self.memory.put(key, entry)
         logger.info(f"💾 Cache SET: {key[:8]}...")
+        
+        # Expiración incremental: un lote pequeño cada CACHE_EXPIRY_INTERVAL
+        if time.time() >= self._next_expiry:
+            self._next_expiry = time.time() + CACHE_EXPIRY_INTERVAL_SECONDS
+            self.expire_batch()
+        return entry
+    
+    def expire_batch(self, limit: int = CACHE_EXPIRY_BATCH) -> int:
+        """Borra hasta `limit` entradas vencidas (y páginas sin revisar en todo el hard TTL)"""
+        now = int(time.time())
+        cursor = self._conn().execute(
+            'DELETE FROM cache WHERE rowid IN '
+            '(SELECT rowid FROM cache WHERE expires_at <= ? LIMIT ?)',
+            (now, limit)
+        )
+        pages = self._conn().execute(
+            'DELETE FROM pages WHERE rowid IN '
+            '(SELECT rowid FROM pages WHERE checked_at <= ? LIMIT ?)',
+            (now - CACHE_STALE_TTL_MINUTES * 60, limit)
+        )
+        return max(cursor.rowcount, pages.rowcount)
+    
+    def get_page(self, url: str) -> Optional['StoredPage']:
+        row = self._conn().execute(
+            'SELECT etag, last_modified, body_hash, listings FROM pages WHERE url = ?', (url,)
+        ).fetchone()
+        return StoredPage(*row) if row else None
+    
+    def set_page(self, url: str, fetched: 'Fetched', body_hash: str, jobs: List['JobListing']):
+        listings = gzip.compress(json.dumps([job.to_dict() for job in jobs]).encode(), compresslevel=6, mtime=0)
+        self._conn().execute(
+            'INSERT OR REPLACE INTO pages (url, etag, last_modified, body_hash, listings, checked_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (url, fetched.etag, fetched.last_modified, body_hash, listings, int(time.time()))
+        )
+    
+    def touch_page(self, url: str, fetched: 'Fetched'):
+        """La página sigue igual: se renuevan la revisión y los validadores que mande la fuente"""
+        self._conn().execute(
+            'UPDATE pages SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), '
+            'checked_at = ? WHERE url = ?',
+            (fetched.etag, fetched.last_modified, int(time.time()), url)
+        )
     
     def cleanup(self):
         """Elimina entradas expiradas"""
-        with sqlite3.connect(self.db_path) as conn:
-            cutoff = (datetime.now() - timedelta(minutes=CACHE_TTL_MINUTES)).isoformat()
-            conn.execute('DELETE FROM cache WHERE created_at < ?', (cutoff,))
-            conn.commit()
+        while self.expire_batch() >= CACHE_EXPIRY_BATCH:
+            pass
+        self.memory.prune()
+    
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """Intenta tomar el lease de una clave; los leases expirados se reemplazan"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM leases WHERE key = ? AND expires_at < ?', (key, now))
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)',
+                (key, owner, now + ttl)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+    
+    def renew_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """Extiende un lease propio y vigente"""
+        now = time.time()
+        cursor = self._conn().execute(
+            'UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ? AND expires_at >= ?',
+            (now + ttl, key, owner, now)
+        )
+        return cursor.rowcount == 1
+    
+    def release_lease(self, key: str, owner: str):
+        self._conn().execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, owner))
+    
+    def stale_at(self, *args) -> Optional[float]:
+        """Momento en que la entrada deja de estar fresca, sin leer el payload"""
+        row = self._conn().execute(
+            'SELECT stale_at FROM cache WHERE key = ? AND expires_at > ?',
+            (self._generate_key(*args), int(time.time()))
+        ).fetchone()
+        return row[0] if row else None
+    
+    @staticmethod
+    def _decayed(score: float, updated_at: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated_at) / (DEMAND_HALF_LIFE_HOURS * 3600))
+    
+    def record_demand(self, counts: Dict[tuple, int]):
+        """Suma peticiones a la demanda de cada (carrera, ubicación)"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for (career, location), count in counts.items():
+                row = conn.execute(
+                    'SELECT score, updated_at FROM demand WHERE career = ? AND location = ?',
+                    (career, location)
+                ).fetchone()
+                score = self._decayed(*row, now) + count if row else count
+                conn.execute(
+                    'INSERT OR REPLACE INTO demand (career, location, score, updated_at) VALUES (?, ?, ?, ?)',
+                    (career, location, score, now)
+                )
+            # Claves que ya nadie pide (menos de 0.1 tras decaer)
+            conn.execute(
+                'DELETE FROM demand WHERE updated_at < ? AND score < ?',
+                (now - DEMAND_HALF_LIFE_HOURS * 3600, 0.2)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def hot_keys(self, limit: int, min_score: float = 0) -> List[tuple]:
+        """(carrera, ubicación, demanda actual) más pedidas primero"""
+        now = time.time()
+        rows = self._conn().execute('SELECT career, location, score, updated_at FROM demand').fetchall()
+        scored = [(career, location, self._decayed(score, updated_at, now))
+                  for career, location, score, updated_at in rows]
+        scored = [row for row in scored if row[2] >= min_score]
+        scored.sort(key=lambda row: -row[2])
+        return scored[:limit]
     
     def stats(self) -> Dict:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM cache')
-            count = cursor.fetchone()[0]
-            return {'entries': count, 'ttl_minutes': CACHE_TTL_MINUTES}
+        count = self._conn().execute(
+            'SELECT COUNT(*) FROM cache WHERE expires_at > ?', (int(time.time()),)
+        ).fetchone()[0]
+        return {
+            'entries': count,
+            'ttl_minutes': CACHE_TTL_MINUTES,
+            'stale_ttl_minutes': CACHE_STALE_TTL_MINUTES,
+            'memory': self.memory.stats()
+        }
 
-cache = CacheDB()
+cache = CacheDB(os.environ.get('CACHE_DB_PATH', 'jobscout_cache.db'))
 
 # ══════════════════════════════════════════════════════════════════════════════
-# HTTP CLIENT MEJORADO
+# SINGLE-FLIGHT - Una sola búsqueda por (carrera, ubicación)
 # ══════════════════════════════════════════════════════════════════════════════
 
-class SmartHTTPClient:
+class _Flight:
     def __init__(self):
-        self.session = requests.Session()
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SearchTimeout(Exception):
+    """Se agotó la espera por una búsqueda idéntica que corría en otro hilo"""
+
+
+class SingleFlight:
+    """Agrupa búsquedas idénticas concurrentes.
     
-    def get_headers(self) -> Dict:
-        ua = random.choice(USER_AGENTS)
-        return {
-            'User-Agent': ua,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'es-MX,es;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-        }
+    Dentro del proceso, los hilos que piden la misma clave esperan al hilo líder.
+    Entre workers de gunicorn, el líder toma un lease en la tabla `leases` del
+    caché SQLite; los demás workers esperan a que el resultado aparezca en caché.
+    """
     
-    def get(self, url: str, retries: int = 3) -> Optional[str]:
-        for attempt in range(retries):
-            try:
-                proxy = proxy_manager.get_proxy()
-                response = self.session.get(
-                    url,
-                    headers=self.get_headers(),
-                    proxies=proxy,
-                    timeout=REQUEST_TIMEOUT,
-                    allow_redirects=True
-                )
-                
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code == 429:
-                    # Rate limited, esperar
-                    time.sleep(2 ** attempt)
-                    continue
-                    
-            except requests.exceptions.Timeout:
-                logger.warning(f"⏱️ Timeout intento {attempt + 1}")
-            except requests.exceptions.ProxyError:
-                logger.warning(f"🔄 Proxy error, reintentando...")
-            except Exception as e:
-                logger.warning(f"⚠️ Error: {str(e)[:50]}")
-            
-            time.sleep(random.uniform(0.5, 1.5))
+    def __init__(self, db: CacheDB, lease_seconds: float = SINGLE_FLIGHT_LEASE_SECONDS,
+                 poll_interval: float = SINGLE_FLIGHT_POLL_SECONDS):
+        self.db = db
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._pid = None
+        self._check_fork()
+    
+    def _check_fork(self):
+        # Tras un fork (gunicorn --preload) cada hijo tiene su propio owner de leases
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self.owner = f"{self._pid}:{id(self):x}"
+            self._lock = threading.Lock()
+            self._flights: Dict[str, _Flight] = {}
+    
+    def do(self, fn, lookup, *args, deadline: Optional['Deadline'] = None):
+        """Ejecuta `fn(deadline)` una sola vez por clave; `lookup()` consulta el caché compartido.
         
-        return None
+        `deadline` es el de la petición: las esperas salen de él y `fn` recibe lo que quede.
+        """
+        deadline = deadline or Deadline(SEARCH_DEADLINE_SECONDS)
+        key = self.db._generate_key(*args)
+        self._check_fork()
+        
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            logger.info(f"⏳ Esperando búsqueda en curso: {key[:8]}...")
+            if not flight.done.wait(timeout=min(self.lease_seconds, deadline.remaining())):
+                result = lookup()
+                if result is None:
+                    raise SearchTimeout("La búsqueda en curso no terminó dentro del presupuesto de la petición")
+                return result
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = self._lead(key, fn, lookup, deadline)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+    
+    def _lead(self, key: str, fn, lookup, deadline: 'Deadline'):
+        while not self.db.acquire_lease(key, self.owner, self.lease_seconds):
+            # Otro worker ya está scrapeando esta clave: esperar su resultado
+            time.sleep(self.poll_interval)
+            result = lookup()
+            if result:
+                logger.info(f"🤝 Resultado compartido por otro worker: {key[:8]}...")
+                return result
+            if deadline.remaining() < SEARCH_MIN_SECONDS:
+                raise SearchTimeout("Otro worker sigue con esta búsqueda y no queda presupuesto para repetirla")
+        
+        try:
+            # Otro worker pudo terminar entre nuestro cache miss y el lease
+            result = lookup()
+            if result:
+                return result
+            if deadline.remaining() < SEARCH_MIN_SECONDS:
+                raise SearchTimeout("No queda presupuesto para scrapear dentro de la petición")
+            return fn(deadline)
+        finally:
+            self.db.release_lease(key, self.owner)
 
-http_client = SmartHTTPClient()
+flights = SingleFlight(cache)
 
 # ══════════════════════════════════════════════════════════════════════════════
-# MODELOS
+# HTTP CLIENT MEJORADO
 # ══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
-class JobListing:
-    title: str
-    company: str
-    location: str
-    link: str
-    source: str
+class TokenBucket:
+    """Limitador token-bucket compartido por todos los hilos del proceso.
     
-    def to_dict(self) -> dict:
-        return asdict(self)
+    Funciona por reservas: cada petición toma un turno y espera solo lo que
+    le corresponde, de modo que los hilos de una misma fuente quedan en fila
+    en lugar de competir por el token.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # Tokens por segundo
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # Retry-After / backoff compartido
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Reserva un token; retorna los segundos a esperar antes de usarlo"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+    
+    def refund(self):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+    
+    def backlog(self) -> float:
+        """Segundos que esperaría una reserva hecha ahora, sin reservar"""
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) - 1
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+    
+    def acquire(self, max_wait: float) -> Optional[float]:
+        """Reserva turno si cabe en `max_wait` y retorna los segundos que faltan para usarlo;
+        si no cabe, devuelve el token y retorna None. No duerme: esperar le toca al llamador.
+        """
+        wait = self.reserve()
+        if wait > max_wait:
+            self.refund()
+            return None
+        return wait
+    
+    def pause(self, seconds: float):
+        """Nadie usa esta fuente durante `seconds` (p.ej. tras un 429)"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'rate_per_second': self.rate,
+                'burst': self.capacity,
+                'tokens': round(self.tokens, 2),
+                'paused_seconds': round(max(0.0, self.blocked_until - time.monotonic()), 1),
+            }
 
-# ══════════════════════════════════════════════════════════════════════════════
-# CONFIGURACIÓN DE CARRERAS
-# ══════════════════════════════════════════════════════════════════════════════
 
-CAREER_CONFIG = {
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After en segundos o como fecha HTTP"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Throttled(Exception):
+    """La petición debe esperar (turno del limitador, Retry-After o backoff).
+    
+    Dentro del pool de scraping no se duerme: la tarea se corta con esta excepción y
+    `_run_scrapers` la vuelve a enviar al pool en `at`, con el intento por el que iba
+    y, si `turn`, el limitador donde ya tiene su turno reservado. Con `waiting_on`
+    (la descarga compartida de otra tarea) se reenvía cuando ese future termine.
+    """
+    
+    def __init__(self, url: str, at: float, attempt: int, turn: Optional[TokenBucket] = None,
+                 waiting_on: Optional[Future] = None):
+        super().__init__(f"{urlsplit(url).netloc}: reintento en {max(at - time.monotonic(), 0):.1f}s")
+        self.url = url
+        self.at = at  # time.monotonic()
+        self.attempt = attempt
+        self.turn = turn
+        self.waiting_on = waiting_on
+        self.owned: Optional[Future] = None  # Descarga compartida que esta tarea encabeza
+    
+    @property
+    def reserved(self) -> bool:
+        return self.turn is not None
+    
+    def release(self):
+        """La tarea ya no va a usar su turno (deadline vencido o cancelada): se devuelve"""
+        turn, self.turn = self.turn, None
+        if turn is not None:
+            turn.refund()
+    
+    def abandon(self):
+        """La tarea no se va a reanudar: devuelve su turno y libera a quienes esperan su descarga"""
+        self.release()
+        if self.owned is not None and not self.owned.done():
+            self.owned.set_result(None)
+
+
+# Las tareas del pool de scraping se reprograman en vez de dormir; fuera de él se duerme
+_deferrable: contextvars.ContextVar[bool] = contextvars.ContextVar('deferrable', default=False)
+# Espera que cortó la ejecución anterior de esta tarea, para retomarla donde iba
+_resumed: contextvars.ContextVar[Optional[Throttled]] = contextvars.ContextVar('resumed', default=None)
+
+
+class Deadline:
+    """Presupuesto de tiempo de una búsqueda, compartido por todas sus peticiones"""
+    
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class LatencyTracker:
+    """Latencias recientes de una fuente, para derivar su timeout"""
+    
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+    
+    def record_timeout(self, timeout: float):
+        """Un intento agotó `timeout`: la latencia real fue al menos eso (muestra censurada).
+        
+        Sin esto una fuente que se vuelve lenta solo produce timeouts, la ventana conserva
+        las muestras rápidas y el timeout nunca sube; así cada timeout lo empuja hacia
+        REQUEST_TIMEOUT (p95 × factor).
+        """
+        self.record(timeout)
+    
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+    
+    def timeout(self) -> float:
+        p95 = self.percentile(0.95)
+        if p95 is None:
+            return REQUEST_TIMEOUT
+        return min(REQUEST_TIMEOUT, max(ADAPTIVE_TIMEOUT_MIN, p95 * ADAPTIVE_TIMEOUT_FACTOR))
+    
+    def stats(self) -> Dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            'samples': len(self.samples),
+            'p50_seconds': round(p50, 2) if p50 is not None else None,
+            'p95_seconds': round(p95, 2) if p95 is not None else None,
+            'timeout_seconds': round(self.timeout(), 2),
+        }
+
+
+@dataclass
+class Fetched:
+    """Respuesta de una fuente: cuerpo nuevo, o `not_modified` ante un GET condicional"""
+    text: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class SharedFetches:
+    """Descargas de un lote de búsquedas: la misma URL se pide a la fuente una sola vez.
+    
+    El primero que pide una URL la descarga; los demás esperan su resultado (hasta
+    su propio deadline) en lugar de gastar otro turno del limitador de la fuente.
+    En el pool esa espera no ocupa un hilo: la tarea sale con `Throttled(waiting_on=...)`.
+    """
+    
+    def __init__(self):
+        self._pages: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.shared = 0
+    
+    def fetch(self, url: str, download, deadline: Optional[Deadline] = None) -> Optional[Fetched]:
+        resumed = _resumed.get()
+        with self._lock:
+            future = self._pages.get(url)
+            resumed = resumed if resumed is not None and resumed.url == url else None
+            # Un líder reprogramado retoma su propia descarga, que sigue pendiente
+            leader = future is None or (resumed is not None and resumed.waiting_on is None)
+            if future is None:
+                future = self._pages[url] = Future()
+                self.fetched += 1
+            elif not leader and resumed is None:
+                self.shared += 1
+        
+        if leader:
+            try:
+                future.set_result(download())
+            except Throttled as e:
+                e.owned = future
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                raise
+        if not future.done() and _deferrable.get():
+            raise Throttled(url, deadline.expires_at if deadline else time.monotonic(), 0, waiting_on=future)
+        try:
+            return future.result(timeout=deadline.remaining() if deadline else None)
+        except TimeoutError:
+            return None
+
+# Lote en curso en este contexto; las tareas del pool lo heredan con copy_context()
+_shared_fetches: contextvars.ContextVar[Optional[SharedFetches]] = contextvars.ContextVar('shared_fetches', default=None)
+
+
+class SmartHTTPClient:
+    def __init__(self):
+        self._sessions: Dict[str, requests.Session] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+    
+    def _session(self, host: str) -> requests.Session:
+        """Una sesión por host, con su propio pool de conexiones"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=HTTP_POOL_SIZES.get(host, HTTP_POOL_MAXSIZE),
+                    max_retries=0
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+    
+    def _tracker(self, host: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._latency.get(host)
+            if tracker is None:
+                tracker = self._latency[host] = LatencyTracker()
+            return tracker
+    
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = SOURCE_RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+    
+    def get_headers(self) -> Dict:
+        ua = random.choice(USER_AGENTS)
+        return {
+            'User-Agent': ua,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'es-MX,es;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1',
+            'Cache-Control': 'max-age=0',
+        }
+    
+    @staticmethod
+    def _upstream_url(url: str) -> str:
+        if not UPSTREAM_BASE_URL:
+            return url
+        parts = urlsplit(url)
+        return f"{UPSTREAM_BASE_URL}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+    
+    def get(self, url: str, retries: int = 3, deadline: Optional[Deadline] = None) -> Optional[str]:
+        fetched = self.fetch(url, retries, deadline)
+        return fetched.text if fetched else None
+    
+    def fetch(self, url: str, retries: int = 3, deadline: Optional[Deadline] = None,
+              stored: Optional[StoredPage] = None, card_marker: bytes = b'', max_cards: int = 0) -> Optional[Fetched]:
+        """GET con los validadores de `stored` (If-None-Match / If-Modified-Since), si los hay.
+        
+        El cuerpo se lee en streaming y se corta al agotar el presupuesto de bytes de la
+        fuente o cuando ya no quedan tarjetas (ver `_read_body`).
+        """
+        with span('http.get', host=urlsplit(url).netloc):
+            download = lambda: self._get(url, retries, deadline, stored, card_marker, max_cards)
+            shared = _shared_fetches.get()
+            if shared is not None:
+                return shared.fetch(url, download, deadline)
+            return download()
+    
+    @staticmethod
+    def _read_body(response: requests.Response, max_bytes: int, card_marker: bytes = b'',
+                   max_cards: int = 0) -> tuple:
+        """Lee el cuerpo por bloques y devuelve (bytes, motivo del corte o None).
+        
+        Corta en `max_bytes` ('budget'); con `card_marker` (un fragmento que aparece una
+        vez por tarjeta), al empezar la tarjeta `max_cards` + 1 o cuando pasan
+        CARD_GAP_BYTES sin otra tarjeta después de la última ('cards'). El corte cae
+        siempre en la misma posición para el mismo contenido, así el hash no cambia.
+        """
+        body = bytearray()
+        found, scan_from, last_card = 0, 0, None
+        for chunk in response.iter_content(HTTP_CHUNK_BYTES):
+            body += chunk
+            if card_marker:
+                while True:
+                    at = body.find(card_marker, scan_from)
+                    if at < 0:
+                        scan_from = max(scan_from, len(body) - len(card_marker) + 1)
+                        break
+                    if max_cards and found == max_cards:
+                        del body[at:]
+                        return body, 'cards'
+                    found += 1
+                    scan_from = last_card = at + len(card_marker)
+                if last_card is not None and len(body) >= last_card + CARD_GAP_BYTES:
+                    del body[last_card + CARD_GAP_BYTES:]
+                    return body, 'cards'
+            if len(body) >= max_bytes:
+                del body[max_bytes:]
+                return body, 'budget'
+        return body, None
+    
+    @staticmethod
+    def _wait(url: str, seconds: float, attempt: int, turn: Optional[TokenBucket] = None):
+        """Espera `seconds` antes del intento `attempt`: reprograma la tarea si está en el pool"""
+        if _deferrable.get():
+            metrics.inc('jobscout_http_deferred_total', host=urlsplit(url).netloc)
+            raise Throttled(url, time.monotonic() + seconds, attempt, turn)
+        time.sleep(seconds)
+    
+    def _get(self, url: str, retries: int, deadline: Optional[Deadline],
+             stored: Optional[StoredPage] = None, card_marker: bytes = b'', max_cards: int = 0) -> Optional[Fetched]:
+        host = urlsplit(url).netloc
+        resumed = _resumed.get()
+        if resumed is not None and resumed.url != url:
+            resumed = None
+        page_url = url
+        url = self._upstream_url(url)
+        session = self._session(host)
+        bucket = self._bucket(host)
+        tracker = self._tracker(host)
+        deadline = deadline or Deadline(retries * (REQUEST_TIMEOUT + RATE_LIMIT_MAX_WAIT))
+        conditional = {}
+        if stored and stored.etag:
+            conditional['If-None-Match'] = stored.etag
+        if stored and stored.last_modified:
+            conditional['If-Modified-Since'] = stored.last_modified
+        
+        for attempt in range(resumed.attempt if resumed else 0, retries):
+            if deadline.remaining() < 1:
+                if resumed:
+                    resumed.release()
+                logger.warning(f"⌛ {host}: sin presupuesto de tiempo, se omite")
+                return None
+            if attempt and not (resumed and resumed.reserved):
+                metrics.inc('jobscout_http_retries_total', host=host)
+            
+            if resumed and resumed.reserved:
+                # El turno se reservó antes de reprogramar la tarea y ya llegó
+                resumed = None
+            else:
+                resumed = None
+                # Turno en el limitador de la fuente, compartido entre hilos
+                max_wait = min(RATE_LIMIT_MAX_WAIT, deadline.remaining() - 1)
+                with span('http.rate_limit', host=host):
+                    wait_seconds = bucket.acquire(max_wait)
+                if wait_seconds is None:
+                    backlog = bucket.backlog()
+                    if _deferrable.get() and backlog < deadline.remaining() - 1:
+                        # Fila llena pero con turno dentro del deadline: vuelve cuando quepa,
+                        # como cuando esperaba en la cola del pool sin reservar
+                        self._wait(page_url, max(backlog - max_wait, 0.5), attempt)
+                    logger.warning(f"🚦 {host}: sin turno en el limitador, se omite")
+                    return None
+                if wait_seconds > 0:
+                    self._wait(page_url, wait_seconds, attempt, turn=bucket)
+            
+            proxy = None if UPSTREAM_BASE_URL else proxy_manager.get_proxy()
+            adaptive = tracker.timeout()
+            timeout = min(adaptive, max(deadline.remaining(), 1))
+            started = time.time()
+            try:
+                with span('http.request', host=host, attempt=attempt + 1, proxy=bool(proxy)) as attrs:
+                    response = session.get(
+                        url,
+                        headers={**self.get_headers(), **conditional},
+                        proxies=proxy,
+                        timeout=timeout,
+                        allow_redirects=True,
+                        stream=True
+                    )
+                    attrs['status'] = response.status_code
+                    body, cut = None, None
+                    try:
+                        if response.status_code == 200:
+                            body, cut = self._read_body(response, SOURCE_MAX_BYTES.get(host, DEFAULT_MAX_BYTES),
+                                                        card_marker, max_cards)
+                            attrs['bytes'] = len(body)
+                    finally:
+                        # Cortar antes del final descarta la conexión en vez de devolverla al pool
+                        response.close()
+                metrics.observe('jobscout_http_request_seconds', time.time() - started, host=host)
+                metrics.inc('jobscout_http_requests_total', host=host, status=response.status_code)
+                
+                if proxy:
+                    # 403/429 a través de un proxy suelen indicar una IP bloqueada
+                    proxy_manager.record(
+                        proxy['http'],
+                        ok=response.status_code < 400 or response.status_code == 404,
+                        latency=time.time() - started
+                    )
+                
+                if response.status_code in (200, 304):
+                    tracker.record(time.time() - started)
+                    if cut:
+                        metrics.inc('jobscout_http_truncated_total', host=host, reason=cut)
+                        if cut == 'budget':
+                            logger.warning(f"✂️ {host}: página cortada en {len(body) // 1024} KB")
+                    return Fetched(
+                        text=body.decode(response.encoding or 'utf-8', errors='replace') if body is not None else None,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                        not_modified=response.status_code == 304
+                    )
+                elif response.status_code in (429, 503):
+                    # Rate limited: se pausa toda la fuente y el reintento toma
+                    # turno al terminar la pausa (el limitador lo reprograma)
+                    metrics.inc('jobscout_http_429_total', host=host)
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    delay = retry_after if retry_after is not None else 2 ** attempt
+                    bucket.pause(delay)
+                    if delay > min(RETRY_AFTER_MAX_WAIT, deadline.remaining()):
+                        logger.warning(f"🚦 {host}: {response.status_code}, Retry-After {delay:.0f}s; se abandona")
+                        return None
+                    continue
+                    
+            except requests.exceptions.Timeout:
+                logger.warning(f"⏱️ Timeout intento {attempt + 1}")
+                metrics.inc('jobscout_http_timeouts_total', host=host)
+                if timeout >= adaptive:
+                    # Recortado por el deadline no dice nada de la fuente
+                    tracker.record_timeout(timeout)
+                self._record_proxy_failure(proxy, started)
+            except requests.exceptions.ProxyError:
+                logger.warning(f"🔄 Proxy error, reintentando...")
+                metrics.inc('jobscout_http_proxy_errors_total', host=host)
+                self._record_proxy_failure(proxy, started)
+            except Exception as e:
+                logger.warning(f"⚠️ Error: {str(e)[:50]}")
+                metrics.inc('jobscout_http_errors_total', host=host)
+                self._record_proxy_failure(proxy, started)
+            
+            if attempt + 1 < retries:
+                with span('http.backoff', host=host):
+                    self._wait(page_url, min(random.uniform(0.5, 1.5), deadline.remaining()), attempt + 1)
+        
+        return None
+    
+    @staticmethod
+    def _record_proxy_failure(proxy: Optional[Dict], started: float):
+        if proxy:
+            proxy_manager.record(proxy['http'], ok=False, latency=time.time() - started)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            hosts = set(self._buckets) | set(self._latency)
+        return {
+            host: {'rate_limit': self._bucket(host).stats(), 'latency': self._tracker(host).stats()}
+            for host in sorted(hosts)
+        }
+
+http_client = SmartHTTPClient()
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MODELOS
+# ══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class JobListing:
+    title: str
+    company: str
+    location: str
+    link: str
+    source: str
+    
+    def __post_init__(self):
+        # Empresas, ubicaciones y fuentes se repiten entre tarjetas: una sola copia por proceso
+        self.company = sys.intern(self.company)
+        self.location = sys.intern(self.location)
+        self.source = sys.intern(self.source)
+    
+    def to_dict(self) -> dict:
+        return {
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'link': self.link,
+            'source': self.source,
+        }
+
+
+@dataclass
+class SearchResult:
+    entry: CacheEntry
+    cached: bool = False
+    age_seconds: float = 0.0
+    stale: bool = False
+    timed_out: List[str] = field(default_factory=list)  # Fuentes que no respondieron a tiempo
+    skipped: List[str] = field(default_factory=list)  # Fuentes omitidas por circuito abierto
+    
+    @property
+    def jobs(self) -> List[dict]:
+        return self.entry.data
+    
+    @property
+    def freshness(self) -> str:
+        if not self.cached:
+            return "live"
+        return "stale" if self.stale else "fresh"
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CONFIGURACIÓN DE CARRERAS
+# ══════════════════════════════════════════════════════════════════════════════
+
+CAREER_CONFIG = {
     "mecatronica": {"keywords": ["ingeniero mecatrónico", "mecatrónica", "automatización", "PLC", "robótica"], "icon": "🤖"},
     "industrial": {"keywords": ["ingeniero industrial", "mejora continua", "lean manufacturing", "producción"], "icon": "🏭"},
     "mecanica": {"keywords": ["ingeniero mecánico", "diseño mecánico", "CAD", "manufactura"], "icon": "⚙️"},
@@ -283,249 +1907,1117 @@ CAREER_CONFIG = {
     "derecho": {"keywords": ["abogado", "legal", "jurídico", "licenciado en derecho"], "icon": "⚖️"}
 }
 
+# ══════════════════════════════════════════════════════════════════════════════
+# PARSER HTML
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _default_parser() -> str:
+    """lxml (C) si está instalado; si no, el parser puro de Python"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+PARSER_BACKEND = os.environ.get('PARSER_BACKEND') or _default_parser()
+
+
+def card_strainer(rules) -> SoupStrainer:
+    """SoupStrainer que solo construye los subárboles de las tarjetas.
+    
+    Cada regla es (tag, atributo, valor):
+      ('div', 'class', 'base-card')   -> la clase contiene el token
+      ('div', 'class*', 'jobCard')    -> el atributo contiene el texto
+      ('article', 'data-id', None)    -> el atributo existe
+    """
+    def keep(name, attrs=None):
+        attrs = attrs or {}
+        for tag, attr, value in rules:
+            if name != tag:
+                continue
+            contains = attr.endswith('*')
+            raw = attrs.get(attr.rstrip('*'))
+            if raw is None:
+                continue
+            if value is None:
+                return True
+            tokens = raw if isinstance(raw, list) else raw.split()
+            if contains and value in ' '.join(tokens):
+                return True
+            if not contains and value in tokens:
+                return True
+        return False
+    
+    return SoupStrainer(keep)
+
 # ══════════════════════════════════════════════════════════════════════════════
 # SCRAPERS HTTP DIRECTOS
 # ══════════════════════════════════════════════════════════════════════════════
 
-class LinkedInScraper:
-    """Scraper para LinkedIn Jobs (versión pública sin login)"""
+class HTMLScraper:
+    """Base de los scrapers: descarga, parsea solo las tarjetas y extrae campos.
     
-    @staticmethod
-    def scrape(keyword: str, location: str) -> List[JobListing]:
-        logger.info(f"🔵 LinkedIn: '{keyword}' en {location}")
+    Cada fuente declara sus selectores; se compilan una vez por clase con
+    soupsieve en lugar de en cada tarjeta.
+    """
+    
+    SOURCE = ""
+    ICON = ""
+    BASE_URL = ""
+    STRAIN_RULES = ()
+    CARD_SELECTOR = ""
+    TITLE_SELECTOR = ""
+    COMPANY_SELECTOR = ""
+    LOCATION_SELECTOR = ""
+    LINK_SELECTOR = ""
+    MAX_CARDS = 0  # 0 = todas las tarjetas de la página
+    CARD_MARKER = b''  # Aparece una vez por tarjeta en el HTML crudo; permite dejar de descargar
+    
+    _compiled = None
+    _strainer = None
+    
+    @classmethod
+    def build_url(cls, keyword: str, location: str, page: int = 0) -> str:
+        """URL de la página `page` (desde 0) de resultados"""
+        raise NotImplementedError
+    
+    @classmethod
+    def clean_link(cls, link: str) -> str:
+        if link.startswith('/'):
+            link = cls.BASE_URL + link
+        return link
+    
+    @classmethod
+    def selectors(cls) -> Dict:
+        # Se guarda en la propia subclase, no en HTMLScraper
+        if cls.__dict__.get('_compiled') is None:
+            cls._compiled = {
+                'card': sv.compile(cls.CARD_SELECTOR),
+                'title': sv.compile(cls.TITLE_SELECTOR),
+                'company': sv.compile(cls.COMPANY_SELECTOR),
+                'location': sv.compile(cls.LOCATION_SELECTOR),
+                'link': sv.compile(cls.LINK_SELECTOR),
+            }
+            cls._strainer = card_strainer(cls.STRAIN_RULES) if cls.STRAIN_RULES else None
+        return cls._compiled
+    
+    @classmethod
+    def scrape(cls, keyword: str, location: str, deadline: Optional[Deadline] = None,
+               page: int = 0) -> List[JobListing]:
+        logger.info(f"{cls.ICON} {cls.SOURCE}: '{keyword}' en {location}" + (f" (página {page + 1})" if page else ""))
         jobs = []
         
-        # LinkedIn jobs públicos
-        url = f"https://www.linkedin.com/jobs/search?keywords={quote(keyword)}&location={quote(location)}&f_TPR=r86400&position=1&pageNum=0"
+        url = cls.build_url(keyword, location, page)
+        stored = cls._stored_page(url)
+        fetched = http_client.fetch(url, deadline=deadline, stored=stored,
+                                    card_marker=cls.CARD_MARKER, max_cards=cls.MAX_CARDS)
+        if not fetched or (fetched.text is None and not stored):
+            logger.warning(f"   ❌ No se pudo obtener {cls.SOURCE}")
+            return jobs
         
-        html = http_client.get(url)
-        if not html:
-            logger.warning("   ❌ No se pudo obtener LinkedIn")
+        # Sin cambios (304 o mismo contenido): las vacantes de la vez anterior, sin parsear
+        body_hash = None if fetched.not_modified else hashlib.blake2b(fetched.text.encode(), digest_size=16).hexdigest()
+        if stored and (fetched.not_modified or body_hash == stored.body_hash):
+            metrics.inc('jobscout_pages_total', source=cls.SOURCE,
+                        result='not_modified' if fetched.not_modified else 'unchanged')
+            try:
+                cache.touch_page(url, fetched)
+                jobs = stored.jobs(location)
+            except Exception as e:
+                logger.warning(f"   ⚠️ Error con la página guardada: {str(e)[:50]}")
+            logger.info(f"   ♻️ {len(jobs)} vacantes (página sin cambios)")
+            return jobs
+        if fetched.text is None:
             return jobs
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # LinkedIn usa diferentes selectores
-            cards = soup.select('div.base-card, div.job-search-card, li.jobs-search-results__list-item')
-            
-            for card in cards[:10]:
-                try:
-                    # Título
-                    title_elem = card.select_one('h3.base-search-card__title, h3.job-search-card__title, a.job-card-list__title')
-                    title = title_elem.get_text(strip=True) if title_elem else None
-                    
-                    # Empresa
-                    company_elem = card.select_one('h4.base-search-card__subtitle, h4.job-search-card__subtitle, a.job-card-container__company-name')
-                    company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
-                    
-                    # Ubicación
-                    location_elem = card.select_one('span.job-search-card__location, span.job-result-card__location')
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
-                    
-                    # Link
-                    link_elem = card.select_one('a.base-card__full-link, a.job-search-card__link-wrapper, a[href*="/jobs/view/"]')
-                    link = link_elem.get('href', '') if link_elem else ''
-                    
-                    if title and link:
-                        # Limpiar link
-                        if link.startswith('/'):
-                            link = 'https://www.linkedin.com' + link
-                        link = link.split('?')[0]
-                        
-                        jobs.append(JobListing(
-                            title=title,
-                            company=company,
-                            location=job_location,
-                            link=link,
-                            source="LinkedIn"
-                        ))
-                except Exception as e:
-                    continue
-                    
+            with span('parse', source=cls.SOURCE), metrics.timer('jobscout_parse_seconds', source=cls.SOURCE):
+                # La URL puede servir a varias ubicaciones: se parsea y guarda sin la de respaldo
+                jobs = cls.parse(fetched.text, '')
         except Exception as e:
-            logger.error(f"   ❌ Error parsing LinkedIn: {str(e)[:50]}")
+            logger.error(f"   ❌ Error parsing {cls.SOURCE}: {str(e)[:50]}")
         
+        metrics.inc('jobscout_pages_total', source=cls.SOURCE, result='parsed')
+        metrics.inc('jobscout_listings_parsed_total', len(jobs), source=cls.SOURCE)
+        try:
+            cache.set_page(url, fetched, body_hash, jobs)
+        except Exception as e:
+            logger.warning(f"   ⚠️ Error guardando la página: {str(e)[:50]}")
+        for job in jobs:
+            if not job.location:
+                job.location = sys.intern(location)
         logger.info(f"   ✅ {len(jobs)} vacantes")
         return jobs
-
-
-class IndeedScraper:
-    """Scraper para Indeed México"""
     
     @staticmethod
-    def scrape(keyword: str, location: str) -> List[JobListing]:
-        logger.info(f"🟣 Indeed: '{keyword}' en {location}")
-        jobs = []
-        
-        url = f"https://mx.indeed.com/jobs?q={quote(keyword)}&l={quote(location)}&sort=date&fromage=7"
-        
-        html = http_client.get(url)
-        if not html:
-            logger.warning("   ❌ No se pudo obtener Indeed")
-            return jobs
-        
+    def _stored_page(url: str) -> Optional[StoredPage]:
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Indeed cards
-            cards = soup.select('div.job_seen_beacon, div.jobsearch-ResultsList > div, td.resultContent')
-            
-            for card in cards[:10]:
-                try:
-                    # Título
-                    title_elem = card.select_one('h2.jobTitle span[title], h2.jobTitle a, a.jcs-JobTitle')
-                    title = title_elem.get_text(strip=True) if title_elem else None
-                    
-                    # Empresa
-                    company_elem = card.select_one('span.companyName, span[data-testid="company-name"]')
-                    company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
-                    
-                    # Ubicación
-                    location_elem = card.select_one('div.companyLocation, div[data-testid="text-location"]')
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
-                    
-                    # Link
-                    link_elem = card.select_one('a[id^="job_"], a.jcs-JobTitle, h2.jobTitle a')
-                    link = link_elem.get('href', '') if link_elem else ''
-                    
-                    if title and link:
-                        if link.startswith('/'):
-                            link = 'https://mx.indeed.com' + link
-                        
-                        jobs.append(JobListing(
-                            title=title,
-                            company=company,
-                            location=job_location,
-                            link=link,
-                            source="Indeed"
-                        ))
-                except:
-                    continue
-                    
+            return cache.get_page(url)
         except Exception as e:
-            logger.error(f"   ❌ Error parsing Indeed: {str(e)[:50]}")
+            logger.warning(f"⚠️ Error leyendo la página guardada: {str(e)[:50]}")
+            return None
+    
+    @classmethod
+    def parse(cls, html: str, location: str) -> List[JobListing]:
+        sel = cls.selectors()
+        soup = BeautifulSoup(html, PARSER_BACKEND, parse_only=cls._strainer)
+        jobs = []
+        
+        for card in sel['card'].select(soup, limit=cls.MAX_CARDS):
+            try:
+                title_elem = sel['title'].select_one(card)
+                title = title_elem.get_text(strip=True) if title_elem else None
+                
+                company_elem = sel['company'].select_one(card)
+                company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
+                
+                location_elem = sel['location'].select_one(card)
+                job_location = location_elem.get_text(strip=True) if location_elem else location
+                
+                link_elem = sel['link'].select_one(card)
+                link = link_elem.get('href', '') if link_elem else ''
+                
+                if title and link:
+                    jobs.append(JobListing(
+                        title=title,
+                        company=company,
+                        location=job_location,
+                        link=cls.clean_link(link),
+                        source=cls.SOURCE
+                    ))
+            except Exception:
+                continue
         
-        logger.info(f"   ✅ {len(jobs)} vacantes")
         return jobs
 
 
-class ComputrabajoScraper:
+class LinkedInScraper(HTMLScraper):
+    """Scraper para LinkedIn Jobs (versión pública sin login)"""
+    
+    SOURCE = "LinkedIn"
+    ICON = "🔵"
+    BASE_URL = "https://www.linkedin.com"
+    STRAIN_RULES = (
+        ('div', 'class', 'base-card'),
+        ('div', 'class', 'job-search-card'),
+        ('li', 'class', 'jobs-search-results__list-item'),
+    )
+    # LinkedIn usa diferentes selectores
+    CARD_SELECTOR = 'div.base-card, div.job-search-card, li.jobs-search-results__list-item'
+    CARD_MARKER = b'data-entity-urn="urn:li:jobPosting:'
+    TITLE_SELECTOR = 'h3.base-search-card__title, h3.job-search-card__title, a.job-card-list__title'
+    COMPANY_SELECTOR = 'h4.base-search-card__subtitle, h4.job-search-card__subtitle, a.job-card-container__company-name'
+    LOCATION_SELECTOR = 'span.job-search-card__location, span.job-result-card__location'
+    LINK_SELECTOR = 'a.base-card__full-link, a.job-search-card__link-wrapper, a[href*="/jobs/view/"]'
+    
+    @classmethod
+    def build_url(cls, keyword: str, location: str, page: int = 0) -> str:
+        # LinkedIn jobs públicos, 25 por página
+        return (f"https://www.linkedin.com/jobs/search?keywords={quote(keyword)}&location={quote(location)}"
+                f"&f_TPR=r86400&position=1&pageNum={page}&start={page * 25}")
+    
+    @classmethod
+    def clean_link(cls, link: str) -> str:
+        return super().clean_link(link).split('?')[0]
+
+
+class IndeedScraper(HTMLScraper):
+    """Scraper para Indeed México"""
+    
+    SOURCE = "Indeed"
+    ICON = "🟣"
+    BASE_URL = "https://mx.indeed.com"
+    STRAIN_RULES = (
+        ('div', 'class', 'job_seen_beacon'),
+        ('div', 'class', 'jobsearch-ResultsList'),
+        ('td', 'class', 'resultContent'),
+    )
+    CARD_SELECTOR = 'div.job_seen_beacon, div.jobsearch-ResultsList > div, td.resultContent'
+    CARD_MARKER = b'class="job_seen_beacon"'
+    TITLE_SELECTOR = 'h2.jobTitle span[title], h2.jobTitle a, a.jcs-JobTitle'
+    COMPANY_SELECTOR = 'span.companyName, span[data-testid="company-name"]'
+    LOCATION_SELECTOR = 'div.companyLocation, div[data-testid="text-location"]'
+    LINK_SELECTOR = 'a[id^="job_"], a.jcs-JobTitle, h2.jobTitle a'
+    
+    @classmethod
+    def build_url(cls, keyword: str, location: str, page: int = 0) -> str:
+        url = f"https://mx.indeed.com/jobs?q={quote(keyword)}&l={quote(location)}&sort=date&fromage=7"
+        return url + (f"&start={page * 10}" if page else "")
+
+
+class ComputrabajoScraper(HTMLScraper):
     """Scraper para Computrabajo México"""
     
+    SOURCE = "Computrabajo"
+    ICON = "🟢"
+    BASE_URL = "https://www.computrabajo.com.mx"
+    STRAIN_RULES = (
+        ('article', 'class', 'box_offer'),
+        ('div', 'class', 'job_item'),
+        ('article', 'data-id', None),
+    )
+    CARD_SELECTOR = 'article.box_offer, div.job_item, article[data-id]'
+    CARD_MARKER = b'<article class="box_offer"'
+    TITLE_SELECTOR = 'h2 a, a.js-o-link, h1.fwB'
+    COMPANY_SELECTOR = 'p.fs16.fc_base, span.enterprise, a.fc_aux'
+    LOCATION_SELECTOR = 'span.location, p.fs13 span'
+    LINK_SELECTOR = 'a[href*="/ofertas-de-trabajo/"], h2 a'
+    
+    @classmethod
+    def build_url(cls, keyword: str, location: str, page: int = 0) -> str:
+        # Estados y ciudades van en la ruta ("-en-nuevo-leon"); el país es la búsqueda general
+        place = canonical_location(location)
+        url = f"https://www.computrabajo.com.mx/trabajo-de-{quote(keyword.replace(' ', '-'))}"
+        if place.level in ('state', 'city'):
+            url += f"-en-{place.key}"
+        return url + (f"?p={page + 1}" if page else "")
+
+
+class OCCMundialScraper(HTMLScraper):
+    """Scraper para OCC Mundial"""
+    
+    SOURCE = "OCC Mundial"
+    ICON = "🟠"
+    BASE_URL = "https://www.occ.com.mx"
+    STRAIN_RULES = (
+        ('div', 'class', 'job-card'),
+        ('article', 'class', 'job'),
+        ('div', 'class*', 'jobCard'),
+    )
+    CARD_SELECTOR = 'div.job-card, article.job, div[class*="jobCard"]'
+    CARD_MARKER = b'id="jobcard-'
+    TITLE_SELECTOR = 'h2 a, a.job-title, h3.title'
+    COMPANY_SELECTOR = 'span.company, div.company-name, p.company'
+    LOCATION_SELECTOR = 'span.location, div.location'
+    LINK_SELECTOR = 'a[href*="/empleo/"]'
+    
+    @classmethod
+    def build_url(cls, keyword: str, location: str, page: int = 0) -> str:
+        url = f"https://www.occ.com.mx/empleos/de-{quote(keyword.replace(' ', '-'))}/"
+        return url + (f"?page={page + 1}" if page else "")
+
+# ══════════════════════════════════════════════════════════════════════════════
+# NORMALIZACIÓN Y CASI-DUPLICADOS - MinHash + LSH sobre títulos normalizados
+# ══════════════════════════════════════════════════════════════════════════════
+
+STOPWORDS = frozenset(
+    'de del la las el los en y e o u para por con sin a al un una se '
+    'the of and or for in at to with '
+    # Ruido frecuente en títulos que no distingue una vacante de otra
+    'urgente vacante empleo contratacion inmediata remoto hibrido presencial home office'.split()
+)
+# Nivel de la vacante: se separa del título y dos niveles distintos nunca son duplicado
+SENIORITY = {
+    'sr': 'senior', 'senior': 'senior',
+    'ssr': 'semisenior', 'semisenior': 'semisenior',
+    'jr': 'junior', 'junior': 'junior',
+    'trainee': 'trainee', 'becario': 'trainee', 'becaria': 'trainee',
+    'practicante': 'trainee', 'intern': 'trainee', 'internship': 'trainee',
+}
+# Razones sociales, ya plegadas; solo se quitan al final del nombre ("Grupo Bimbo S.A.B. de C.V.")
+LEGAL_SUFFIXES = [
+    's a b de c v', 's a p i de c v', 's de r l de c v', 's a de c v', 's c de r l', 'de c v',
+    's a p i', 's a b', 's de r l', 's r l', 's a', 's c',
+    'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'gmbh', 'plc',
+]
+# Nombre ya sin acentos ni razón social -> nombre canónico
+COMPANY_ALIASES = {
+    'bbva bancomer': 'bbva',
+    'bancomer': 'bbva',
+    'grupo bimbo': 'bimbo',
+    'walmex': 'walmart',
+    'walmart centroamerica': 'walmart',
+    'mercadolibre': 'mercado libre',
+    'puerto liverpool': 'liverpool',
+    'empresa confidencial': 'confidencial',
+    'confidential': 'confidencial',
+    'walmart de mexico': 'walmart',
+}
+# Empresa genérica de las vacantes sin nombre: no sirve para detectar duplicados
+CONFIDENTIAL_COMPANY = 'confidencial'
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def _suffix_pattern(suffix: str) -> str:
+    # Las iniciales pueden venir juntas o separadas: "sa de cv" y "s a de c v"
+    words = suffix.split()
+    pattern = words[0]
+    for prev, word in zip(words, words[1:]):
+        pattern += (' ?' if len(prev) == len(word) == 1 else ' ') + word
+    return pattern
+
+
+# Una o más razones sociales seguidas al final; nunca la primera palabra del nombre
+_LEGAL_SUFFIX = re.compile(r'(?: (?:%s))+$' % '|'.join(map(_suffix_pattern, LEGAL_SUFFIXES)))
+
+# Permutaciones (a*h + b) mod p con p primo de Mersenne; los coeficientes son fijos porque
+# las firmas se comparan entre workers y se guardan en el índice. Cambiar DEDUP_BANDS/DEDUP_ROWS
+# o este esquema exige subir JobIndex.SIGNATURE_VERSION.
+_MINHASH_PRIME = (1 << 61) - 1
+_minhash_rng = random.Random(1801)
+_MINHASH_PERMUTATIONS = [
+    (_minhash_rng.randrange(1, _MINHASH_PRIME), _minhash_rng.randrange(_MINHASH_PRIME))
+    for _ in range(DEDUP_BANDS * DEDUP_ROWS)
+]
+
+
+def fold(text: str) -> str:
+    """Minúsculas, sin acentos y solo letras/dígitos separados por un espacio"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def normalize_title(title: str) -> tuple:
+    """(tokens del título, nivel) con stopwords fuera y el nivel aparte"""
+    tokens, levels = [], set()
+    for word in fold(title).replace('semi senior', 'semisenior').split():
+        if word in SENIORITY:
+            levels.add(SENIORITY[word])
+        elif word not in STOPWORDS:
+            tokens.append(word)
+    return tokens, ' '.join(sorted(levels))
+
+
+def canonical_company(company: str) -> str:
+    name = _LEGAL_SUFFIX.sub('', fold(company))
+    return COMPANY_ALIASES.get(name, name) or CONFIDENTIAL_COMPANY
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big') % _MINHASH_PRIME
+
+
+def minhash(tokens: List[str]) -> tuple:
+    """Firma MinHash de los trigramas de cada token: insensible al orden de las palabras"""
+    shingles = {_shingle_hash(f"#{token}#"[i:i + 3]) for token in tokens for i in range(len(token))}
+    shingles = shingles or {0}
+    p = _MINHASH_PRIME
+    return tuple(min([(a * h + b) % p for h in shingles]) for a, b in _MINHASH_PERMUTATIONS)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    company: str
+    seniority: str
+    signature: tuple
+    
+    @cached_property
+    def bands(self) -> List[int]:
+        """Llaves LSH: una por banda, siempre dentro de la misma empresa"""
+        keys = []
+        for band in range(DEDUP_BANDS):
+            rows = self.signature[band * DEDUP_ROWS:(band + 1) * DEDUP_ROWS]
+            digest = hashlib.blake2b(f"{self.company}|{band}|{rows}".encode(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'big', signed=True))
+        return keys
+    
+    def matches(self, other: 'Fingerprint') -> bool:
+        if self.company != other.company or len(self.signature) != len(other.signature):
+            return False
+        if self.company == CONFIDENTIAL_COMPANY:
+            return False
+        if self.seniority and other.seniority and self.seniority != other.seniority:
+            return False
+        agree = sum(a == b for a, b in zip(self.signature, other.signature))
+        return agree >= DEDUP_SIMILARITY * len(self.signature)
+
+
+@lru_cache(maxsize=20000)
+def fingerprint(title: str, company: str) -> Fingerprint:
+    tokens, seniority = normalize_title(title)
+    return Fingerprint(canonical_company(company), seniority, minhash(tokens))
+
+
+@lru_cache(maxsize=20000)
+def exact_key(title: str, company: str) -> int:
+    """Duplicado exacto: mismo título normalizado y misma empresa canónica (también sin empresa)"""
+    digest = hashlib.blake2b(f"{canonical_company(company)}|exact|{fold(title)}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class NearDuplicates:
+    """Detector en memoria para una búsqueda: cada vacante se compara solo con su cubeta LSH"""
+    
+    def __init__(self):
+        self._buckets: Dict[int, List[Fingerprint]] = {}
+        self._links = set()
+        self._exact = set()
+    
+    def add(self, job: JobListing) -> bool:
+        """True si la vacante es nueva; False si ya hay un duplicado o casi-duplicado"""
+        # La misma tarjeta vuelve en varias keywords y páginas
+        exact = exact_key(job.title, job.company)
+        if (job.link and job.link in self._links) or exact in self._exact:
+            return False
+        if job.link:
+            self._links.add(job.link)
+        self._exact.add(exact)
+        fp = fingerprint(job.title, job.company)
+        if fp.company == CONFIDENTIAL_COMPANY:
+            # Sin empresa, dos títulos parecidos pueden ser vacantes de empresas distintas
+            return True
+        for key in fp.bands:
+            for other in self._buckets.get(key, ()):
+                if fp.matches(other):
+                    return False
+        for key in fp.bands:
+            self._buckets.setdefault(key, []).append(fp)
+        return True
+
+# ══════════════════════════════════════════════════════════════════════════════
+# UBICACIONES - Forma canónica y jerarquía país > estado > ciudad
+# ══════════════════════════════════════════════════════════════════════════════
+
+# (clave, nombre canónico, nivel, clave del padre, alias ya sin acentos)
+LOCATION_TABLE = [
+    ('mexico', 'México', 'country', None,
+     ['mx', 'republica mexicana', 'todo mexico', 'nacional']),
+    ('remoto', 'Remoto', 'remote', None,
+     ['remote', 'home office', 'teletrabajo', 'trabajo remoto', 'desde casa']),
+    ('ciudad-de-mexico', 'Ciudad de México', 'state', 'mexico',
+     ['cdmx', 'df', 'd f', 'distrito federal', 'mexico city', 'mexico df', 'cd de mexico', 'cd mexico']),
+    ('estado-de-mexico', 'Estado de México', 'state', 'mexico',
+     ['edomex', 'edo mex', 'edo de mexico', 'mex', 'mexico state']),
+    ('nuevo-leon', 'Nuevo León', 'state', 'mexico', ['n l', 'nl']),
+    ('jalisco', 'Jalisco', 'state', 'mexico', ['jal']),
+    ('queretaro', 'Querétaro', 'state', 'mexico', ['qro', 'queretaro arteaga']),
+    ('puebla', 'Puebla', 'state', 'mexico', ['pue']),
+    ('guanajuato', 'Guanajuato', 'state', 'mexico', ['gto']),
+    ('baja-california', 'Baja California', 'state', 'mexico', ['b c', 'bc']),
+    ('yucatan', 'Yucatán', 'state', 'mexico', ['yuc']),
+    ('coahuila', 'Coahuila', 'state', 'mexico', ['coah', 'coahuila de zaragoza']),
+    ('chihuahua', 'Chihuahua', 'state', 'mexico', ['chih']),
+    ('sonora', 'Sonora', 'state', 'mexico', ['son']),
+    ('veracruz', 'Veracruz', 'state', 'mexico', ['ver']),
+    ('san-luis-potosi', 'San Luis Potosí', 'state', 'mexico', ['slp', 's l p']),
+    ('aguascalientes', 'Aguascalientes', 'state', 'mexico', ['ags']),
+    ('monterrey', 'Monterrey', 'city', 'nuevo-leon', ['mty']),
+    ('san-pedro-garza-garcia', 'San Pedro Garza García', 'city', 'nuevo-leon', []),
+    ('apodaca', 'Apodaca', 'city', 'nuevo-leon', []),
+    ('guadalajara', 'Guadalajara', 'city', 'jalisco', ['gdl']),
+    ('zapopan', 'Zapopan', 'city', 'jalisco', []),
+    ('toluca', 'Toluca', 'city', 'estado-de-mexico', ['toluca de lerdo']),
+    ('naucalpan', 'Naucalpan', 'city', 'estado-de-mexico', ['naucalpan de juarez']),
+    ('tlalnepantla', 'Tlalnepantla', 'city', 'estado-de-mexico', ['tlalnepantla de baz']),
+    ('santiago-de-queretaro', 'Santiago de Querétaro', 'city', 'queretaro', []),
+    ('tijuana', 'Tijuana', 'city', 'baja-california', ['tj']),
+    ('mexicali', 'Mexicali', 'city', 'baja-california', []),
+    ('merida', 'Mérida', 'city', 'yucatan', []),
+    ('leon', 'León', 'city', 'guanajuato', ['leon de los aldama']),
+    ('saltillo', 'Saltillo', 'city', 'coahuila', []),
+    ('ciudad-juarez', 'Ciudad Juárez', 'city', 'chihuahua', ['cd juarez']),
+    ('hermosillo', 'Hermosillo', 'city', 'sonora', []),
+]
+# Palabras que LinkedIn y otros agregan alrededor del nombre ("Greater Monterrey Area")
+LOCATION_NOISE = frozenset('greater area metropolitan metropolitana zona region'.split())
+
+
+@dataclass(frozen=True)
+class Location:
+    key: str
+    name: str
+    level: str  # country | state | city | remote | unknown
+    parent: Optional[str] = None
+    
+    def contains(self, other: 'Location') -> bool:
+        """Si `other` es esta ubicación o está dentro de ella"""
+        place = other
+        while place is not None:
+            if place.key == self.key:
+                return True
+            place = LOCATIONS.get(place.parent)
+        return False
+
+
+LOCATIONS: Dict[str, Location] = {
+    key: Location(key, name, level, parent) for key, name, level, parent, _ in LOCATION_TABLE
+}
+LOCATION_ALIASES: Dict[str, str] = {}
+for _key, _name, _, _, _aliases in LOCATION_TABLE:
+    for _alias in [_key.replace('-', ' '), fold(_name), *_aliases]:
+        LOCATION_ALIASES[_alias] = _key
+
+
+# Texto original de las ubicaciones desconocidas, por nombre plegado: las claves de
+# caché/demanda usan el plegado y las fuentes y respuestas reciben lo que se escribió
+_LOCATION_TEXT: Dict[str, str] = {}
+LOCATION_TEXT_MAX = 4096
+
+
+def location_text(name: str) -> str:
+    """Texto para consultar a las fuentes y mostrar de un nombre de `canonical_location`"""
+    return _LOCATION_TEXT.get(name, name)
+
+
+def _match_location(part: str) -> Optional[Location]:
+    folded = fold(part)
+    key = LOCATION_ALIASES.get(folded)
+    if key is None:
+        key = LOCATION_ALIASES.get(' '.join(w for w in folded.split() if w not in LOCATION_NOISE))
+    return LOCATIONS.get(key)
+
+
+@lru_cache(maxsize=4096)
+def canonical_location(raw: str) -> Location:
+    """Ubicación canónica de un texto libre ("CDMX", "Monterrey, N.L.", "Mexico City, Mexico").
+    
+    Se prueba el texto completo y luego cada parte separada por comas, de la más
+    específica a la más general. Lo desconocido se nombra por su texto plegado
+    ("Torreón" y "torreon " son la misma clave); `location_text` da el original.
+    """
+    raw = ' '.join((raw or '').split())
+    name = fold(raw)
+    if not name:
+        return LOCATIONS['mexico']
+    for part in [raw, *raw.split(',')]:
+        place = _match_location(part)
+        if place:
+            return place
+    if len(_LOCATION_TEXT) < LOCATION_TEXT_MAX:
+        _LOCATION_TEXT.setdefault(name, raw)
+    return Location(name.replace(' ', '-'), name, 'unknown')
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ÍNDICE DE VACANTES - Todas las vacantes vistas, con búsqueda de texto completo
+# ══════════════════════════════════════════════════════════════════════════════
+
+class JobIndex:
+    """Almacén persistente de cada vacante que devolvió algún scraper.
+    
+    Una fila por link con first_seen/last_seen. La búsqueda usa FTS5 (sin
+    acentos ni mayúsculas) si el SQLite lo trae; si no, LIKE sobre la tabla.
+    """
+    
+    SIGNATURE_VERSION = 3  # Subirlo recalcula los clusters con la normalización/MinHash actuales
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self.fts = self._fts_available()
+        self._init_db()
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Conexión del hilo actual (se recrea tras un fork de gunicorn)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=10000')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
     @staticmethod
-    def scrape(keyword: str, location: str) -> List[JobListing]:
-        logger.info(f"🟢 Computrabajo: '{keyword}' en {location}")
-        jobs = []
+    def _fts_available() -> bool:
+        try:
+            sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE t USING fts5(a)')
+            return True
+        except sqlite3.OperationalError:
+            logger.warning("⚠️ SQLite sin FTS5: el índice de vacantes usará LIKE")
+            return False
+    
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS listings (
+                id INTEGER PRIMARY KEY,
+                link TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                company TEXT NOT NULL,
+                location TEXT NOT NULL,
+                source TEXT NOT NULL,
+                career TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        ''')
+        # Casi-duplicados: firma MinHash y cluster (id de la primera vacante del grupo)
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(listings)')}
+        for column, kind in (('cluster_id', 'INTEGER'), ('company_key', 'TEXT'),
+                             ('seniority', 'TEXT'), ('signature', 'BLOB')):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE listings ADD COLUMN {column} {kind}')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_listings_last_seen ON listings(last_seen)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_listings_unclustered ON listings(id) WHERE cluster_id IS NULL')
+        # Cubetas LSH, solo de la vacante que encabeza cada cluster
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket INTEGER,
+                listing_id INTEGER,
+                PRIMARY KEY (bucket, listing_id)
+            ) WITHOUT ROWID
+        ''')
+        if conn.execute('PRAGMA user_version').fetchone()[0] < self.SIGNATURE_VERSION:
+            # Firmas de otra versión no son comparables: las filas vuelven a agruparse de a poco
+            conn.execute('DELETE FROM lsh_buckets')
+            conn.execute('UPDATE listings SET cluster_id = NULL, signature = NULL WHERE cluster_id IS NOT NULL')
+            conn.execute(f'PRAGMA user_version = {self.SIGNATURE_VERSION}')
+        if not self.fts:
+            return
+        # Tabla FTS de contenido externo, sincronizada con triggers. Volver a ver
+        # una vacante solo cambia last_seen y no toca el índice de texto.
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+                title, company, location,
+                content='listings', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS listings_ai AFTER INSERT ON listings BEGIN
+                INSERT INTO listings_fts (rowid, title, company, location)
+                VALUES (new.id, new.title, new.company, new.location);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS listings_au AFTER UPDATE OF title, company, location ON listings
+            WHEN old.title IS NOT new.title OR old.company IS NOT new.company OR old.location IS NOT new.location
+            BEGIN
+                INSERT INTO listings_fts (listings_fts, rowid, title, company, location)
+                VALUES ('delete', old.id, old.title, old.company, old.location);
+                INSERT INTO listings_fts (rowid, title, company, location)
+                VALUES (new.id, new.title, new.company, new.location);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS listings_ad AFTER DELETE ON listings BEGIN
+                INSERT INTO listings_fts (listings_fts, rowid, title, company, location)
+                VALUES ('delete', old.id, old.title, old.company, old.location);
+            END
+        ''')
+    
+    def ingest(self, jobs: List[JobListing], career: Optional[str] = None) -> int:
+        """Inserta vacantes nuevas, actualiza last_seen de las ya conocidas y agrupa las nuevas
+        con sus casi-duplicados. Las filas sin cluster de índices anteriores se completan
+        de a poco en cada ingesta.
+        """
+        now = time.time()
+        rows = [(job.link, job.title, job.company, job.location, job.source, career, now, now)
+                for job in jobs if job.link]
+        if not rows:
+            return 0
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('''
+                INSERT INTO listings (link, title, company, location, source, career, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (link) DO UPDATE SET
+                    title = excluded.title,
+                    company = excluded.company,
+                    location = excluded.location,
+                    career = COALESCE(excluded.career, career),
+                    last_seen = excluded.last_seen
+            ''', rows)
+            links = list({row[0] for row in rows})
+            unclustered = []
+            for i in range(0, len(links), 500):
+                batch = links[i:i + 500]
+                unclustered += conn.execute(
+                    f'SELECT id, title, company FROM listings '
+                    f'WHERE cluster_id IS NULL AND link IN ({",".join("?" * len(batch))}) ORDER BY id',
+                    batch
+                ).fetchall()
+            unclustered += conn.execute(
+                'SELECT id, title, company FROM listings WHERE cluster_id IS NULL ORDER BY id LIMIT ?',
+                (INDEX_BACKFILL_BATCH,)
+            ).fetchall()
+            for listing_id, title, company in dict.fromkeys(unclustered):
+                self._cluster(conn, listing_id, title, company)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(rows)
+    
+    @staticmethod
+    def _cluster(conn: sqlite3.Connection, listing_id: int, title: str, company: str):
+        """Asigna el cluster de una vacante: el de su primer casi-duplicado o uno propio.
         
-        # Normalizar ubicación para Computrabajo
-        location_slug = location.lower().replace(' ', '-').replace('á', 'a').replace('é', 'e').replace('í', 'i').replace('ó', 'o').replace('ú', 'u')
+        Solo se consultan las cubetas LSH de la vacante, así que el costo no crece con
+        el tamaño del índice sino con el de sus cubetas, que solo guardan encabezados.
+        """
+        fp = fingerprint(title, company)
+        cluster_id = None
+        if fp.company == CONFIDENTIAL_COMPANY:
+            # Sin empresa solo se agrupan duplicados exactos, con una cubeta por título
+            exact = exact_key(title, company)
+            row = conn.execute(
+                'SELECT l.cluster_id FROM lsh_buckets b JOIN listings l ON l.id = b.listing_id '
+                'WHERE b.bucket = ? AND l.id != ? ORDER BY l.id LIMIT 1',
+                (exact, listing_id)
+            ).fetchone()
+            conn.execute('UPDATE listings SET cluster_id = ?, company_key = ? WHERE id = ?',
+                         (row[0] if row else listing_id, fp.company, listing_id))
+            if row is None:
+                conn.execute('INSERT OR IGNORE INTO lsh_buckets (bucket, listing_id) VALUES (?, ?)',
+                             (exact, listing_id))
+            return
+        candidates = conn.execute(
+            f'SELECT id, cluster_id, company_key, seniority, signature FROM listings '
+            f'WHERE id IN (SELECT listing_id FROM lsh_buckets WHERE bucket IN ({",".join("?" * len(fp.bands))})) '
+            f'ORDER BY id',
+            fp.bands
+        )
+        for other_id, other_cluster, other_company, other_seniority, signature in candidates:
+            if other_id != listing_id and fp.matches(
+                    Fingerprint(other_company, other_seniority, tuple(array('Q', signature)))):
+                cluster_id = other_cluster
+                break
         
-        url = f"https://www.computrabajo.com.mx/trabajo-de-{quote(keyword.replace(' ', '-'))}"
+        conn.execute(
+            'UPDATE listings SET cluster_id = ?, company_key = ?, seniority = ?, signature = ? WHERE id = ?',
+            (cluster_id or listing_id, fp.company, fp.seniority, array('Q', fp.signature).tobytes(), listing_id)
+        )
+        if cluster_id is None:
+            conn.executemany(
+                'INSERT OR IGNORE INTO lsh_buckets (bucket, listing_id) VALUES (?, ?)',
+                [(key, listing_id) for key in fp.bands]
+            )
+    
+    def first_seen(self, links) -> Dict[str, float]:
+        """Cuándo se vio por primera vez cada link (los que no están en el índice se omiten)"""
+        links = list(links)
+        seen = {}
+        for i in range(0, len(links), 500):
+            batch = links[i:i + 500]
+            seen.update(self._conn().execute(
+                f'SELECT link, first_seen FROM listings WHERE link IN ({",".join("?" * len(batch))})', batch
+            ))
+        return seen
+    
+    def known_links(self, source: str, links) -> set:
+        """Los links que la fuente ya había entregado antes"""
+        links = list(links)
+        known = set()
+        # Por tandas, debajo del límite de parámetros de SQLite
+        for i in range(0, len(links), 500):
+            batch = links[i:i + 500]
+            known.update(row[0] for row in self._conn().execute(
+                f'SELECT link FROM listings WHERE source = ? AND link IN ({",".join("?" * len(batch))})',
+                [source, *batch]
+            ))
+        return known
+    
+    @staticmethod
+    def _match(text: str, column: Optional[str] = None) -> str:
+        # Cada palabra como prefijo entre comillas: el texto del usuario nunca es sintaxis FTS
+        terms = ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+        return f"{column} : ({terms})" if column else terms
+    
+    def search(self, q: str = '', location: str = '', company: str = '', source: str = '', career: str = '',
+               since: Optional[float] = None, limit: int = 50, offset: int = 0,
+               distinct: bool = True) -> List[Dict]:
+        """Vacantes del índice; con texto, las más relevantes primero, si no las más recientes.
         
-        html = http_client.get(url)
-        if not html:
-            logger.warning("   ❌ No se pudo obtener Computrabajo")
-            return jobs
+        `since` (epoch) deja solo las vacantes vistas por primera vez desde ese momento.
+        Con `distinct` se entrega solo la primera vacante de cada cluster de casi-duplicados.
+        """
+        sql = ('SELECT l.title, l.company, l.location, l.link, l.source, l.first_seen, l.last_seen, '
+               'l.cluster_id FROM listings l')
+        where, params = [], []
+        order = 'l.last_seen DESC'
+        text_filters = [(value, column) for value, column in
+                        ((q, None), (location, 'location'), (company, 'company')) if re.search(r'\w', value)]
         
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            cards = soup.select('article.box_offer, div.job_item, article[data-id]')
-            
-            for card in cards[:10]:
-                try:
-                    title_elem = card.select_one('h2 a, a.js-o-link, h1.fwB')
-                    title = title_elem.get_text(strip=True) if title_elem else None
-                    
-                    company_elem = card.select_one('p.fs16.fc_base, span.enterprise, a.fc_aux')
-                    company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
-                    
-                    location_elem = card.select_one('span.location, p.fs13 span')
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
-                    
-                    link_elem = card.select_one('a[href*="/ofertas-de-trabajo/"], h2 a')
-                    link = link_elem.get('href', '') if link_elem else ''
-                    
-                    if title and link:
-                        if link.startswith('/'):
-                            link = 'https://www.computrabajo.com.mx' + link
-                        
-                        jobs.append(JobListing(
-                            title=title,
-                            company=company,
-                            location=job_location,
-                            link=link,
-                            source="Computrabajo"
-                        ))
-                except:
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"   ❌ Error parsing Computrabajo: {str(e)[:50]}")
+        if text_filters and self.fts:
+            sql += ' JOIN listings_fts f ON f.rowid = l.id'
+            where.append('listings_fts MATCH ?')
+            params.append(' AND '.join(self._match(value, column) for value, column in text_filters))
+            if q:
+                # Relevancia (bm25) solo cuando hay texto libre
+                order = 'f.rank, l.last_seen DESC'
+        else:
+            for value, column in text_filters:
+                columns = [column] if column else ['title', 'company', 'location']
+                for word in re.findall(r'\w+', value):
+                    where.append('(' + ' OR '.join(f'l.{c} LIKE ?' for c in columns) + ')')
+                    params.extend([f'%{word}%'] * len(columns))
+        if source:
+            where.append('l.source = ?')
+            params.append(source)
+        if career:
+            where.append('l.career = ?')
+            params.append(career)
+        if since is not None:
+            where.append('l.first_seen >= ?')
+            params.append(since)
         
-        logger.info(f"   ✅ {len(jobs)} vacantes")
-        return jobs
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {order}'
+        if distinct:
+            # El cursor se lee solo hasta juntar `limit` clusters distintos
+            rows = self._one_per_cluster(self._conn().execute(sql, params), limit, offset)
+        else:
+            rows = self._conn().execute(sql + ' LIMIT ? OFFSET ?', [*params, limit, offset])
+        
+        return [
+            {'title': title, 'company': company, 'location': job_location, 'link': link, 'source': job_source,
+             'first_seen': datetime.fromtimestamp(first_seen).isoformat(timespec='seconds'),
+             'last_seen': datetime.fromtimestamp(last_seen).isoformat(timespec='seconds')}
+            for title, company, job_location, link, job_source, first_seen, last_seen, _ in rows
+        ]
+    
+    @staticmethod
+    def _one_per_cluster(rows, limit: int, offset: int):
+        clusters = set()
+        skipped = taken = 0
+        for row in rows:
+            cluster_id = row[-1]
+            if cluster_id is not None:
+                if cluster_id in clusters:
+                    continue
+                clusters.add(cluster_id)
+            if skipped < offset:
+                skipped += 1
+                continue
+            yield row
+            taken += 1
+            if taken >= limit:
+                return
+    
+    def stats(self) -> Dict:
+        count, clusters, oldest = self._conn().execute(
+            'SELECT COUNT(*), COUNT(DISTINCT cluster_id), MIN(first_seen) FROM listings'
+        ).fetchone()
+        return {
+            'listings': count,
+            'clusters': clusters,
+            'fts': self.fts,
+            'since': datetime.fromtimestamp(oldest).isoformat(timespec='seconds') if oldest else None
+        }
+
+job_index = JobIndex(os.environ.get('INDEX_DB_PATH', 'jobscout_index.db'))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# RANKING - Relevancia por keywords de la carrera, ubicación y recencia
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _load_numpy():
+    """numpy si está instalado; si no, el ranking corre en Python puro"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+np = _load_numpy() if os.environ.get('RANK_BACKEND', 'numpy') == 'numpy' else None
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """'keywords=0.6,location=0.25,recency=0.15' -> pesos; los que falten quedan en su default"""
+    weights = dict(DEFAULT_RANK_WEIGHTS)
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        name, _, value = part.partition('=')
+        if name.strip() not in weights:
+            raise ValueError(f"Peso desconocido: {name.strip()}")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def stem(word: str) -> str:
+    """Raíz burda para español: sin plural ni género (mecatrónico ~ mecatrónica)"""
+    for suffix in ('es', 'os', 'as', 'o', 'a', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=20000)
+def title_terms(title: str) -> frozenset:
+    return frozenset(stem(token) for token in normalize_title(title)[0])
+
+
+class CareerTerms:
+    """Vectores de términos de las keywords de una carrera, precalculados una vez.
+    
+    Cada término pesa su idf entre carreras ("ingeniero" aparece en varias y pesa
+    menos que "mecatrónic") y cada keyword se normaliza a suma 1: el puntaje de
+    keywords de un título es el de la keyword que mejor cubre.
+    """
+    
+    def __init__(self, career: str, document_frequency: Dict[str, int], careers: int):
+        keyword_terms = [title_terms(keyword) for keyword in CAREER_CONFIG[career]["keywords"]]
+        self.vocabulary = {term: i for i, term in enumerate(sorted(set().union(*keyword_terms)))}
+        self.rows = []
+        for terms in keyword_terms:
+            idf = {term: math.log(1 + careers / document_frequency[term]) for term in terms}
+            total = sum(idf.values()) or 1.0
+            self.rows.append({self.vocabulary[term]: weight / total for term, weight in idf.items()})
+        if np is not None:
+            self.matrix = np.zeros((len(self.vocabulary), len(self.rows)), dtype=np.float32)
+            for k, row in enumerate(self.rows):
+                for i, weight in row.items():
+                    self.matrix[i, k] = weight
+    
+    @classmethod
+    def build_all(cls) -> Dict[str, 'CareerTerms']:
+        per_career = {career: set().union(*(title_terms(k) for k in config["keywords"]))
+                      for career, config in CAREER_CONFIG.items()}
+        frequency: Dict[str, int] = {}
+        for terms in per_career.values():
+            for term in terms:
+                frequency[term] = frequency.get(term, 0) + 1
+        return {career: cls(career, frequency, len(per_career)) for career in CAREER_CONFIG}
+    
+    def scores(self, titles: List[frozenset]) -> list:
+        """Puntaje de keywords (0..1) de cada título"""
+        vocabulary = self.vocabulary
+        if np is not None:
+            hits = np.zeros((len(titles), len(vocabulary)), dtype=np.float32)
+            for n, terms in enumerate(titles):
+                for term in terms:
+                    i = vocabulary.get(term)
+                    if i is not None:
+                        hits[n, i] = 1.0
+            return (hits @ self.matrix).max(axis=1) if self.rows else np.zeros(len(titles), dtype=np.float32)
+        results = []
+        for terms in titles:
+            present = {vocabulary[term] for term in terms if term in vocabulary}
+            results.append(max((sum(w for i, w in row.items() if i in present) for row in self.rows), default=0.0))
+        return results
 
 
-class OCCMundialScraper:
-    """Scraper para OCC Mundial"""
+class Ranker:
+    """Ordena las vacantes de una búsqueda por relevancia antes de guardarlas en caché.
     
-    @staticmethod
-    def scrape(keyword: str, location: str) -> List[JobListing]:
-        logger.info(f"🟠 OCC Mundial: '{keyword}' en {location}")
-        jobs = []
-        
-        url = f"https://www.occ.com.mx/empleos/de-{quote(keyword.replace(' ', '-'))}/"
-        
-        html = http_client.get(url)
-        if not html:
-            logger.warning("   ❌ No se pudo obtener OCC")
-            return jobs
-        
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
+    puntaje = keywords × w_k + ubicación × w_u + recencia × w_r, con los pesos de
+    RANK_WEIGHTS. Los empates se intercalan por fuente para no agrupar una sola.
+    """
+    
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+        self._careers: Optional[Dict[str, CareerTerms]] = None
+        self._lock = threading.Lock()
+    
+    def terms(self, career: str) -> CareerTerms:
+        with self._lock:
+            if self._careers is None:
+                self._careers = CareerTerms.build_all()
+            return self._careers[career]
+    
+    def rank(self, jobs: List[JobListing], career: str, location: str) -> List[JobListing]:
+        if len(jobs) < 2:
+            return list(jobs)
+        with span('rank', jobs=len(jobs)):
+            keyword = self.terms(career).scores([title_terms(job.title) for job in jobs])
+            place = canonical_location(location)
+            nearby = [self._location_score(place, canonical_location(job.location)) for job in jobs]
+            recent = self._recency_scores(jobs)
             
-            cards = soup.select('div.job-card, article.job, div[class*="jobCard"]')
+            w = self.weights
+            if np is not None:
+                score = (w['keywords'] * np.asarray(keyword, dtype=np.float32)
+                         + w['location'] * np.asarray(nearby, dtype=np.float32)
+                         + w['recency'] * np.asarray(recent, dtype=np.float32)).tolist()
+            else:
+                score = [w['keywords'] * k + w['location'] * l + w['recency'] * r
+                         for k, l, r in zip(keyword, nearby, recent)]
             
-            for card in cards[:10]:
-                try:
-                    title_elem = card.select_one('h2 a, a.job-title, h3.title')
-                    title = title_elem.get_text(strip=True) if title_elem else None
-                    
-                    company_elem = card.select_one('span.company, div.company-name, p.company')
-                    company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
-                    
-                    location_elem = card.select_one('span.location, div.location')
-                    job_location = location_elem.get_text(strip=True) if location_elem else location
-                    
-                    link_elem = card.select_one('a[href*="/empleo/"]')
-                    link = link_elem.get('href', '') if link_elem else ''
-                    
-                    if title and link:
-                        if link.startswith('/'):
-                            link = 'https://www.occ.com.mx' + link
-                        
-                        jobs.append(JobListing(
-                            title=title,
-                            company=company,
-                            location=job_location,
-                            link=link,
-                            source="OCC Mundial"
-                        ))
-                except:
-                    continue
-                    
+            # Desempate: la 1a de cada fuente, luego la 2a de cada una, etc.
+            turn, seen = [], {}
+            for job in jobs:
+                seen[job.source] = seen.get(job.source, -1) + 1
+                turn.append(seen[job.source])
+            order = sorted(range(len(jobs)), key=lambda i: (-round(score[i], 4), turn[i]))
+            return [jobs[i] for i in order]
+    
+    @staticmethod
+    def _location_score(place: Location, job_place: Location) -> float:
+        if job_place.level == 'remote':
+            return RANK_REMOTE_SCORE
+        if place.contains(job_place):
+            return 1.0
+        if job_place.contains(place):
+            # Vacante publicada a nivel estado o país cuando se pidió una ciudad
+            return 0.5
+        return 0.0
+    
+    @staticmethod
+    def _recency_scores(jobs: List[JobListing]) -> List[float]:
+        """1 para lo recién visto; decae a la mitad cada RANK_RECENCY_HALF_LIFE_HOURS desde first_seen"""
+        try:
+            first_seen = job_index.first_seen(job.link for job in jobs)
         except Exception as e:
-            logger.error(f"   ❌ Error parsing OCC: {str(e)[:50]}")
-        
-        logger.info(f"   ✅ {len(jobs)} vacantes")
-        return jobs
+            logger.warning(f"⚠️ Error consultando el índice: {str(e)[:50]}")
+            first_seen = {}
+        now = time.time()
+        half_life = RANK_RECENCY_HALF_LIFE_HOURS * 3600
+        return [0.5 ** (max(now - first_seen.get(job.link, now), 0) / half_life) for job in jobs]
+
+ranker = Ranker(parse_weights(os.environ.get('RANK_WEIGHTS', '')))
 
 # ══════════════════════════════════════════════════════════════════════════════
 # MOTOR DE BÚSQUEDA PARALELO
 # ══════════════════════════════════════════════════════════════════════════════
 
+class CircuitBreaker:
+    """Circuito por fuente: se abre tras fallos seguidos y prueba de nuevo tras el cooldown"""
+    
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+    
+    def __init__(self, name: str, threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 cooldown: float = BREAKER_COOLDOWN_SECONDS):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and now - self.opened_at < self.cooldown:
+                return False
+            # Half-open: una sola prueba a la vez (una prueba perdida se reintenta tras el cooldown)
+            if self.state == self.HALF_OPEN and now - self.probe_started < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_started = now
+            logger.info(f"🔌 {self.name}: circuito medio abierto, probando")
+            return True
+    
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                if self.state != self.CLOSED:
+                    logger.info(f"🔌 {self.name}: circuito cerrado")
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"🔌 {self.name}: circuito abierto por {self.cooldown}s")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'retry_in_seconds': round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)))
+                if self.state == self.OPEN else 0,
+            }
+
+
+# Pool único y acotado para todo el proceso: los cache miss concurrentes
+# comparten hilos en lugar de crear un ThreadPoolExecutor cada uno
+scrape_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='scraper')
+# Aparte del de scraping: sus hilos esperan tareas de scrape_executor y no deben ocuparlo
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix='batch')
+
 class SearchEngine:
     def __init__(self):
         self.scrapers = [
@@ -534,66 +3026,886 @@ class SearchEngine:
             ComputrabajoScraper.scrape,
             OCCMundialScraper.scrape,
         ]
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.breakers: Dict = {}
+        self._breaker_lock = threading.Lock()
+    
+    def breaker(self, scraper) -> CircuitBreaker:
+        """Circuito de un scraper de `self.scrapers`"""
+        with self._breaker_lock:
+            if scraper not in self.breakers:
+                self.breakers[scraper] = CircuitBreaker(scraper.__self__.SOURCE)
+            return self.breakers[scraper]
     
-    def search(self, career: str, location: str) -> List[dict]:
+    def breaker_stats(self) -> Dict:
+        breakers = [self.breaker(scraper) for scraper in self.scrapers]
+        return {breaker.name: breaker.stats() for breaker in breakers}
+    
+    def search(self, career: str, location: str) -> SearchResult:
+        # Un solo presupuesto desde que entra la petición: esperas y scrape salen de él
+        deadline = Deadline(SEARCH_DEADLINE_SECONDS)
         if career not in CAREER_CONFIG:
             raise ValueError(f"Carrera no válida: {career}")
+        location = canonical_location(location).name
         
-        # Revisar caché
-        cached = cache.get(career, location)
+        # Revisar caché (stale-while-revalidate)
+        cached = self._lookup(career, location)
         if cached:
+            if cached.stale:
+                self.refresh_async(career, location)
             return cached
         
+        return self._search_live(career, location, deadline=deadline)
+    
+    def search_many(self, pairs: List[tuple]) -> Dict[tuple, object]:
+        """Varias búsquedas en una llamada: (carrera, ubicación) -> SearchResult o la excepción.
+        
+        Todas las claves (y las de sus estados y país) se leen del caché con una sola
+        consulta. Los faltantes se planean juntos: las ubicaciones amplias se buscan
+        primero y sus ciudades se filtran de ellas si alcanza; el resto se scrapea en
+        `batch_executor` compartiendo las descargas de URLs idénticas (`SharedFetches`).
+        """
+        pairs = list(dict.fromkeys((career, canonical_location(location).name) for career, location in pairs))
+        for career, _ in pairs:
+            if career not in CAREER_CONFIG:
+                raise ValueError(f"Carrera no válida: {career}")
+        
+        ancestors = {pair: self._ancestors(pair[1]) for pair in pairs}
+        wanted = set(pairs) | {(career, name) for (career, _), names in ancestors.items() for name in names}
+        entries = cache.get_many(list(wanted))
+        
+        results: Dict[tuple, object] = {}
+        misses = []
+        for career, location in pairs:
+            cached = self._lookup(career, location, entries)
+            if cached is None:
+                misses.append((career, location))
+                continue
+            if cached.stale:
+                self.refresh_async(career, location)
+            results[(career, location)] = cached
+        if not misses:
+            return results
+        
+        # Oleadas: primero lo que no tiene un estado o país pendiente en el mismo lote
+        waves: Dict[int, List[tuple]] = {}
+        missing = set(misses)
+        for career, location in misses:
+            depth = sum((career, name) in missing for name in ancestors[(career, location)])
+            waves.setdefault(depth, []).append((career, location))
+        
+        shared = SharedFetches()
+        token = _shared_fetches.set(shared)
+        try:
+            for depth in sorted(waves):
+                futures = {
+                    batch_executor.submit(contextvars.copy_context().run, self._search_planned,
+                                          career, location, depth > 0): (career, location)
+                    for career, location in waves[depth]
+                }
+                for future, pair in futures.items():
+                    try:
+                        results[pair] = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Error en lote {pair[0]} / {pair[1]}: {e}")
+                        results[pair] = e
+        finally:
+            _shared_fetches.reset(token)
+        logger.info(f"📦 Lote: {len(pairs)} búsquedas, {len(misses)} sin caché, "
+                    f"{shared.fetched} descargas ({shared.shared} compartidas)")
+        return results
+    
+    @staticmethod
+    def _ancestors(location: str) -> List[str]:
+        """Nombres del estado y el país que contienen `location`, del más cercano al más amplio"""
+        names = []
+        parent = LOCATIONS.get(canonical_location(location).parent)
+        while parent is not None:
+            names.append(parent.name)
+            parent = LOCATIONS.get(parent.parent)
+        return names
+    
+    def _search_planned(self, career: str, location: str, after_broader: bool) -> SearchResult:
+        # Si su estado o país se acaba de buscar en el lote, puede bastar con filtrarlo
+        if after_broader:
+            derived = self._from_broader(career, location)
+            if derived:
+                return derived
+        return self._search_live(career, location)
+    
+    def fresh_result(self, career: str, location: str) -> Optional[SearchResult]:
+        """Resultado fresco del caché (propio o filtrado de una ubicación más amplia), sin scrapear"""
+        return self._from_cache(career, location, allow_stale=False) or self._from_broader(career, location)
+    
+    def refresh_async(self, career: str, location: str, force: bool = False):
+        """Refresca una clave en segundo plano; ignora si ya hay un refresh en curso.
+        
+        Con `force` scrapea aunque la entrada siga fresca (pre-calentamiento antes del soft TTL).
+        """
+        key = (career, location)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def run():
+            try:
+                logger.info(f"🔁 Refrescando en segundo plano: {career} / {location}")
+                self._search_live(career, location, force=force)
+            except Exception as e:
+                logger.error(f"❌ Error refrescando {career}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def search_stream(self, career: str, location: str):
+        """Como `search`, pero entrega ('source', fuente, vacantes) conforme termina cada
+        scraper y al final ('result', SearchResult). El resultado completo se guarda en caché.
+        """
+        if career not in CAREER_CONFIG:
+            raise ValueError(f"Carrera no válida: {career}")
+        location = canonical_location(location).name
+        deadline = Deadline(SEARCH_DEADLINE_SECONDS)
+        
+        cached = self._lookup(career, location)
+        if cached:
+            if cached.stale:
+                self.refresh_async(career, location)
+            yield ('source', 'cache', cached.jobs)
+            yield ('result', cached)
+            return
+        
+        events = queue.Queue()
+        
+        def run():
+            try:
+                # Si ya hay un scrape igual en curso, solo llega el resultado final
+                result = flights.do(
+                    lambda left: self._scrape(career, location, left,
+                                              on_source=lambda src, jobs: events.put(('source', src, jobs))),
+                    lambda: self._from_cache(career, location, allow_stale=False),
+                    career, location, deadline=deadline
+                )
+                events.put(('result', result))
+            except Exception as e:
+                events.put(('error', e))
+        
+        threading.Thread(target=run, name='search-stream', daemon=True).start()
+        
+        streamed = False
+        while True:
+            try:
+                event = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ('keepalive',)
+                continue
+            if event[0] == 'source':
+                streamed = True
+            elif event[0] == 'result' and not streamed:
+                # Otro hilo o worker hizo el scrape: se entrega todo de una vez
+                yield ('source', 'shared', event[1].jobs)
+            yield event
+            if event[0] in ('result', 'error'):
+                return
+    
+    def _lookup(self, career: str, location: str, entries: Optional[Dict] = None) -> Optional[SearchResult]:
+        """Consulta del caché para una petición de usuario (cuenta en las métricas).
+        
+        `entries` son entradas ya leídas con `cache.get_many` (la clave y sus estados y
+        país); sin ellas se leen del caché una por una.
+        """
+        with span('cache.lookup') as attrs:
+            if entries is None:
+                cached = self._from_cache(career, location)
+            else:
+                cached = self._as_result(entries.get((career, location)))
+            result = 'miss' if not cached else 'stale' if cached.stale else 'hit'
+            if not cached or cached.stale:
+                broader = self._from_broader(career, location, entries)
+                if broader:
+                    cached, result = broader, 'broader'
+            attrs['result'] = result
+        metrics.inc('jobscout_cache_requests_total', result=result)
+        return cached
+    
+    def _from_broader(self, career: str, location: str, entries: Optional[Dict] = None) -> Optional[SearchResult]:
+        """Resultado fresco de un estado o del país que contiene `location`, filtrado a ella"""
+        place = canonical_location(location)
+        parent = LOCATIONS.get(place.parent)
+        while parent is not None:
+            if entries is None:
+                entry = cache.get_entry(career, parent.name, allow_stale=False)
+            else:
+                entry = entries.get((career, parent.name))
+                entry = entry if entry and not entry.stale else None
+            if entry and entry.total:
+                jobs = [job for job in entry.data if place.contains(canonical_location(job['location']))
+                        or canonical_location(job['location']).level == 'remote']
+                if len(jobs) >= BROADER_MIN_JOBS:
+                    logger.info(f"💾 Cache {parent.name} → {place.name}: {len(jobs)} de {entry.total}")
+                    derived = entry.derive(jobs)
+                    return SearchResult(entry=derived, cached=True, age_seconds=derived.age_seconds)
+            parent = LOCATIONS.get(parent.parent)
+        return None
+    
+    def _from_cache(self, career: str, location: str, allow_stale: bool = True) -> Optional[SearchResult]:
+        return self._as_result(cache.get_entry(career, location, allow_stale=allow_stale))
+    
+    @staticmethod
+    def _as_result(entry: Optional[CacheEntry]) -> Optional[SearchResult]:
+        if not entry or not entry.total:
+            return None
+        return SearchResult(
+            entry=entry,
+            cached=True,
+            age_seconds=entry.age_seconds,
+            stale=entry.stale
+        )
+    
+    def _search_live(self, career: str, location: str, force: bool = False,
+                     deadline: Optional[Deadline] = None) -> SearchResult:
+        # Un solo scrape por clave, aunque lleguen muchas peticiones a la vez. Forzado, la
+        # entrada fresca actual no cuenta: solo una escrita después de empezar (por otro worker)
+        since = int(time.time()) if force else None
+        with span('search.live'):
+            return flights.do(
+                lambda left: self._scrape(career, location, left),
+                lambda: self._fresh_since(career, location, since),
+                career, location, deadline=deadline
+            )
+    
+    def _fresh_since(self, career: str, location: str, since: Optional[int]) -> Optional[SearchResult]:
+        result = self._from_cache(career, location, allow_stale=False)
+        if result and since is not None and result.entry.created_at < since:
+            return None
+        return result
+    
+    def _scrape(self, career: str, location: str, deadline: Deadline, on_source=None) -> SearchResult:
+        metrics.inc('jobscout_searches_in_flight')
+        try:
+            with metrics.timer('jobscout_search_seconds'):
+                return self._scrape_sources(career, location, deadline, on_source)
+        finally:
+            metrics.inc('jobscout_searches_in_flight', -1)
+    
+    def _scrape_sources(self, career: str, location: str, deadline: Deadline, on_source=None) -> SearchResult:
         config = CAREER_CONFIG[career]
-        keyword = config["keywords"][0]
-        all_jobs: List[JobListing] = []
+        keywords = config["keywords"]
+        timed_out: List[str] = []
+        skipped: List[str] = []
         
         logger.info("═" * 50)
         logger.info(f"🔍 BÚSQUEDA: {config['icon']} {career}")
-        logger.info(f"   Keyword: {keyword} | Ubicación: {location}")
+        logger.info(f"   Keywords: {', '.join(keywords)} | Ubicación: {location}")
         logger.info("═" * 50)
         
-        # Búsqueda paralela
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = {
-                executor.submit(scraper, keyword, location): scraper.__qualname__
-                for scraper in self.scrapers
-            }
-            
-            for future in as_completed(futures, timeout=30):
-                try:
-                    jobs = future.result()
-                    all_jobs.extend(jobs)
-                except Exception as e:
-                    logger.error(f"❌ Error en scraper: {e}")
-        
-        # Eliminar duplicados
-        seen = set()
-        unique_jobs = []
-        for job in all_jobs:
-            key = (job.title.lower()[:50], job.company.lower()[:30])
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
+        # Búsqueda paralela + eliminar casi-duplicados conforme llegan
+        seen = NearDuplicates()
+        scraped: List[JobListing] = []
+        unique_jobs: List[JobListing] = []
+        for source, jobs in self._run_scrapers(keywords, location_text(location), deadline, timed_out, skipped):
+            scraped.extend(jobs)
+            with span('dedup', source=source):
+                new_jobs = self._dedupe(jobs, seen)
+            unique_jobs.extend(new_jobs)
+            if on_source:
+                on_source(source, [job.to_dict() for job in new_jobs])
         
-        random.shuffle(unique_jobs)
+        # Ordenadas por relevancia: el caché guarda la lista ya rankeada
+        unique_jobs = ranker.rank(unique_jobs, career, location)
         
         logger.info(f"✅ Total: {len(unique_jobs)} vacantes únicas")
         
-        result = [job.to_dict() for job in unique_jobs]
+        # Todo lo scrapeado (duplicados entre fuentes incluidos) alimenta el índice
+        with span('index.ingest'):
+            try:
+                job_index.ingest(scraped, career)
+            except Exception as e:
+                logger.warning(f"⚠️ Error indexando vacantes: {str(e)[:50]}")
+        del scraped
+        
+        with span('serialize'):
+            result = [job.to_dict() for job in unique_jobs]
         
-        # Guardar en caché
-        if result:
-            cache.set(result, career, location)
+        # Guardar en caché (los resultados parciales con TTL corto)
+        with span('cache.set'):
+            if result:
+                soft_ttl = PARTIAL_CACHE_TTL_MINUTES * 60 if timed_out or skipped else None
+                entry = cache.set(result, career, location, soft_ttl=soft_ttl)
+            else:
+                entry = CacheEntry.from_data(result)
         
-        return result
+        return SearchResult(entry=entry, timed_out=timed_out, skipped=skipped)
+    
+    def _run_scrapers(self, keywords: List[str], location: str, deadline: Deadline,
+                      timed_out: List[str], skipped: List[str]):
+        """Corre cada (fuente, keyword) en el pool compartido, paginando, y entrega
+        (fuente, vacantes) por página en orden de llegada.
+        
+        Cada cadena pide la página 1; mientras su última tanda traiga links nuevos pide
+        las siguientes PAGE_WINDOW páginas a la vez, hasta MAX_PAGES. Una página vacía o
+        con solo links que la fuente ya entregó (en el índice o en esta búsqueda) detiene
+        la cadena. Las fuentes con circuito abierto se anotan en `skipped` sin lanzarse;
+        las que no respondieron ninguna página antes del deadline, en `timed_out`.
+        
+        Una tarea que debe esperar turno en el limitador (o un Retry-After) sale del pool
+        con `Throttled` y queda en `delayed` hasta su hora: ningún hilo duerme esperando.
+        """
+        paging = Deadline(min(PAGINATION_SECONDS, deadline.remaining()))
+        pending = {}  # future -> (scraper, keyword, página)
+        delayed = []  # heap de (hora monotonic, n, (scraper, keyword, página), Throttled)
+        turns: Dict[Future, Throttled] = {}  # Tareas reenviadas con su Throttled, por si se cancelan
+        waiting: Dict[Future, List[tuple]] = {}  # descarga compartida -> tareas que esperan su resultado
+        window: Dict[tuple, int] = {}  # (fuente, keyword) -> páginas de la tanda sin responder
+        next_page: Dict[tuple, int] = {}
+        stopped = set()
+        seen_links: Dict[str, set] = {}
+        answered: Dict[str, bool] = {}  # fuente -> si alguna página trajo vacantes
+        
+        def submit(scraper, keyword: str, page: int, resumed: Optional[Throttled] = None):
+            # Cada tarea lleva una copia del contexto para registrar spans en la traza de la petición
+            context = contextvars.copy_context()
+            context.run(_deferrable.set, True)
+            context.run(_resumed.set, resumed)
+            future = scrape_executor.submit(context.run, self._run_scraper,
+                                            scraper, keyword, location, deadline if page == 0 else paging, page)
+            pending[future] = (scraper, keyword, page)
+            if resumed is not None:
+                turns[future] = resumed
+        
+        launched = []
+        for scraper in self.scrapers:
+            source = scraper.__self__.SOURCE
+            if not self.breaker(scraper).allow():
+                skipped.append(source)
+                continue
+            launched.append(scraper)
+            seen_links[source] = set()
+            for keyword in keywords:
+                window[(source, keyword)] = 1
+                next_page[(source, keyword)] = 1
+                submit(scraper, keyword, 0)
+        if skipped:
+            logger.info(f"🔌 Circuito abierto, se omite: {', '.join(skipped)}")
+        
+        try:
+            while pending or delayed or waiting:
+                while delayed and delayed[0][0] <= time.monotonic():
+                    _, _, task, throttled = heapq.heappop(delayed)
+                    submit(*task, resumed=throttled)
+                if deadline.expired:
+                    break
+                timeout = deadline.remaining()
+                if delayed:
+                    timeout = min(timeout, delayed[0][0] - time.monotonic())
+                done, _ = wait([*pending, *waiting], timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in waiting:
+                        # Terminó la descarga compartida: quienes la esperaban ya la encuentran lista
+                        for task, throttled in waiting.pop(future):
+                            submit(*task, resumed=throttled)
+                        continue
+                    scraper, keyword, page = pending.pop(future)
+                    turns.pop(future, None)
+                    source = scraper.__self__.SOURCE
+                    chain = (source, keyword)
+                    throttled = future.exception()
+                    if isinstance(throttled, Throttled):
+                        # Sigue en la tanda: vuelve al pool cuando le toque
+                        if throttled.waiting_on is not None:
+                            waiting.setdefault(throttled.waiting_on, []).append(((scraper, keyword, page), throttled))
+                        else:
+                            heapq.heappush(delayed, (throttled.at, id(throttled), (scraper, keyword, page), throttled))
+                        continue
+                    window[chain] -= 1
+                    try:
+                        jobs = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Error en scraper {source}: {e}")
+                        stopped.add(chain)
+                        continue
+                    answered[source] = answered.get(source, False) or bool(jobs)
+                    if not self._has_new_links(source, jobs, seen_links[source]):
+                        stopped.add(chain)
+                    yield source, jobs
+                    
+                    if (window[chain] == 0 and chain not in stopped
+                            and next_page[chain] < MAX_PAGES and paging.remaining() >= 2):
+                        first, last = next_page[chain], min(next_page[chain] + PAGE_WINDOW, MAX_PAGES)
+                        for next_one in range(first, last):
+                            submit(scraper, keyword, next_one)
+                        window[chain], next_page[chain] = last - first, last
+        finally:
+            for future in pending:
+                if future.cancel() and future in turns:
+                    turns[future].abandon()
+            for *_, throttled in delayed:
+                throttled.abandon()
+        
+        unanswered = [*pending.values(), *(d[2] for d in delayed), *(t for ts in waiting.values() for t, _ in ts)]
+        late = {scraper.__self__.SOURCE for scraper, _, _ in unanswered}
+        timed_out.extend(source for source in late if source not in answered)
+        if timed_out:
+            logger.warning(f"⌛ Sin respuesta a tiempo: {', '.join(timed_out)}")
+        for scraper in launched:
+            # Ninguna vacante en ninguna página suele significar bloqueo o selectores rotos
+            self.breaker(scraper).record(answered.get(scraper.__self__.SOURCE, False))
+    
+    @staticmethod
+    def _has_new_links(source: str, jobs: List[JobListing], seen: set) -> bool:
+        """Si la página trae links que la fuente no había entregado; los anota en `seen`"""
+        links = {job.link for job in jobs} - seen
+        seen.update(links)
+        if not links:
+            return False
+        try:
+            known = job_index.known_links(source, links)
+        except Exception as e:
+            logger.warning(f"⚠️ Error consultando el índice: {str(e)[:50]}")
+            known = set()
+        return len(known) < len(links)
+    
+    def _run_scraper(self, scraper, keyword: str, location: str, deadline: Deadline,
+                     page: int = 0) -> List[JobListing]:
+        # Si esperó en la cola más que el presupuesto, ya no vale la pena
+        if deadline.expired:
+            resumed = _resumed.get()
+            if resumed:
+                resumed.abandon()
+            return []
+        source = scraper.__self__.SOURCE
+        with span('scrape', source=source, keyword=keyword, page=page + 1), \
+                metrics.timer('jobscout_source_seconds', source=source):
+            return scraper(keyword, location, deadline=deadline, page=page)
+    
+    @staticmethod
+    def _dedupe(jobs: List[JobListing], seen: NearDuplicates) -> List[JobListing]:
+        return [job for job in jobs if seen.add(job)]
 
 engine = SearchEngine()
 
+# ══════════════════════════════════════════════════════════════════════════════
+# PRE-CALENTAMIENTO - Refresca las búsquedas más pedidas antes de que venzan
+# ══════════════════════════════════════════════════════════════════════════════
+
+class Prewarmer:
+    """Aprende las claves calientes de las peticiones reales y las refresca a tiempo.
+    
+    Cada worker acumula conteos en memoria y los vuelca a la tabla `demand` del
+    caché una vez por ciclo. Solo el worker que tiene el lease del scheduler
+    planea refrescos: las claves más pedidas cuyo soft TTL vence pronto.
+    
+    Un refresco cuesta hasta keywords × MAX_PAGES peticiones a cada fuente, así
+    que el ciclo se dimensiona contra el token bucket más lento: entran refrescos
+    (a lo más PREWARM_MAX_PER_CYCLE) mientras su costo quepa en PREWARM_RATE_SHARE
+    de ese límite durante el intervalo, y tras cada uno se espera, con jitter, lo
+    que el bucket tarda en reponer esas peticiones. El resto queda para el tráfico real.
+    """
+    
+    LEASE_KEY = 'prewarm-scheduler'
+    
+    def __init__(self, db: CacheDB, engine: SearchEngine):
+        self.db = db
+        self.engine = engine
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.leader = False
+        self.last_refreshed: List[tuple] = []
+    
+    @property
+    def owner(self) -> str:
+        return f"prewarm:{os.getpid()}:{id(self):x}"
+    
+    @staticmethod
+    def cost(career: str) -> int:
+        """Peticiones que un refresco puede hacer a cada fuente (todas las páginas)"""
+        return len(CAREER_CONFIG[career]['keywords']) * MAX_PAGES
+    
+    @staticmethod
+    def rate() -> float:
+        """Peticiones por segundo a cada fuente que puede gastar el pre-calentamiento"""
+        slowest = min(rate for rate, _ in [*SOURCE_RATE_LIMITS.values(), DEFAULT_RATE_LIMIT])
+        return slowest * PREWARM_RATE_SHARE
+    
+    def record(self, career: str, location: str):
+        with self._lock:
+            key = (career, location)
+            self._counts[key] = self._counts.get(key, 0) + 1
+        self.start()
+    
+    def start(self):
+        """Arranca el scheduler en segundo plano (una vez por proceso)"""
+        if not PREWARM_ENABLED:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='prewarm', daemon=True)
+            self._thread.start()
+    
+    def _loop(self):
+        while True:
+            started = time.time()
+            try:
+                due = self.run_once()
+                self._dispatch(due)
+            except Exception as e:
+                logger.warning(f"⚠️ Error en pre-calentamiento: {str(e)[:50]}")
+            # Jitter para que los ciclos de distintos workers no coincidan
+            interval = PREWARM_INTERVAL_SECONDS * random.uniform(0.9, 1.1)
+            time.sleep(max(interval - (time.time() - started), 1))
+    
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if counts:
+            self.db.record_demand(counts)
+    
+    def run_once(self) -> List[tuple]:
+        """Vuelca conteos y, si este worker es el scheduler, retorna las claves a refrescar"""
+        self.flush()
+        self.leader = (self.db.renew_lease(self.LEASE_KEY, self.owner, PREWARM_INTERVAL_SECONDS * 3)
+                       or self.db.acquire_lease(self.LEASE_KEY, self.owner, PREWARM_INTERVAL_SECONDS * 3))
+        if not self.leader:
+            return []
+        
+        refresh_before = time.time() + PREWARM_LEAD_SECONDS
+        budget = self.rate() * PREWARM_INTERVAL_SECONDS
+        spent = 0
+        due = []
+        for career, location, _ in self.db.hot_keys(PREWARM_TOP_KEYS, PREWARM_MIN_SCORE):
+            if career not in CAREER_CONFIG:
+                continue
+            stale_at = self.db.stale_at(career, location)
+            if stale_at is None or stale_at <= refresh_before:
+                # El primero entra aunque no quepa: _dispatch alarga el ciclo lo necesario
+                if due and spent + self.cost(career) > budget:
+                    break
+                due.append((career, location))
+                spent += self.cost(career)
+                if len(due) >= PREWARM_MAX_PER_CYCLE:
+                    break
+        return due
+    
+    def _dispatch(self, due: List[tuple]):
+        # Tras cada refresco, lo que tarda el bucket más lento en reponer sus peticiones
+        # (con jitter); si el ciclo se pasa del intervalo, el siguiente empieza después
+        for career, location in due:
+            logger.info(f"🔥 Pre-calentando: {career} / {location}")
+            # Todavía está fresca (vence dentro de PREWARM_LEAD): hay que forzar el scrape
+            self.engine.refresh_async(career, location, force=True)
+            time.sleep(self.cost(career) / self.rate() * random.uniform(0.75, 1.25))
+        self.last_refreshed = due
+    
+    def stats(self) -> Dict:
+        return {
+            'enabled': PREWARM_ENABLED,
+            'leader': self.leader,
+            'last_refreshed': [f"{career} / {location}" for career, location in self.last_refreshed],
+            'hot': [
+                {'career': career, 'location': location, 'score': round(score, 1)}
+                for career, location, score in self.db.hot_keys(10, PREWARM_MIN_SCORE)
+            ]
+        }
+
+prewarmer = Prewarmer(cache, engine)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# BÚSQUEDAS ASÍNCRONAS - Cola de trabajos fuera del ciclo de la petición
+# ══════════════════════════════════════════════════════════════════════════════
+
+class SearchJobs:
+    """Cola de búsquedas en la tabla `search_jobs` del caché, visible para todos los workers.
+    
+    `submit` responde de inmediato con el id; el scrape corre en un pool aparte
+    (SEARCH_JOBS_MODE=local, en el mismo proceso web) o en `python app.py worker`
+    (SEARCH_JOBS_MODE=external, los workers web solo encolan). Un envío repetido de
+    la misma búsqueda se une al trabajo en curso. El resultado queda en el caché.
+    """
+    
+    def __init__(self, db: CacheDB, engine: SearchEngine):
+        self.db = db
+        self.engine = engine
+        self._pool = None
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+        self._running = set()  # Trabajos que corren en este proceso
+        self._heartbeat = None
+        self._pid = None
+    
+    @property
+    def owner(self) -> str:
+        return f"{os.getpid()}:{threading.get_ident():x}"
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=SEARCH_JOB_WORKERS, thread_name_prefix='search-job')
+            return self._pool
+    
+    def submit(self, career: str, location: str) -> Dict:
+        """Crea el trabajo o se une al que ya corre para la misma búsqueda"""
+        now = time.time()
+        fresh = self.engine.fresh_result(career, location)
+        conn = self.db._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "SELECT id FROM search_jobs WHERE career = ? AND location = ? "
+                "AND status IN ('queued', 'running') AND updated_at > ? ORDER BY created_at LIMIT 1",
+                (career, location, now - SEARCH_JOB_STALE_SECONDS)
+            ).fetchone()
+            if row:
+                job_id, created = row[0], False
+            else:
+                job_id, created = uuid.uuid4().hex, True
+                # Con resultado fresco en caché el trabajo nace terminado
+                conn.execute(
+                    'INSERT INTO search_jobs (id, career, location, status, created_at, updated_at, '
+                    'finished_at, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (job_id, career, location, 'done' if fresh else 'queued', now, now,
+                     now if fresh else None, json.dumps(self._summary(fresh)) if fresh else None)
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        if created and not fresh and SEARCH_JOBS_MODE == 'local':
+            self._executor().submit(self._execute, job_id, career, location)
+        self._cleanup(now)
+        return {**self.get(job_id), "attached": not created}
+    
+    def _claim(self, job_id: str) -> bool:
+        cursor = self.db._conn().execute(
+            "UPDATE search_jobs SET status = 'running', owner = ?, updated_at = ? WHERE id = ? AND status = 'queued'",
+            (self.owner, time.time(), job_id)
+        )
+        return cursor.rowcount == 1
+    
+    def _claim_next(self) -> Optional[tuple]:
+        """El trabajo encolado más antiguo, ya marcado como propio"""
+        conn = self.db._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "SELECT id, career, location FROM search_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE search_jobs SET status = 'running', owner = ?, updated_at = ? WHERE id = ?",
+                    (self.owner, time.time(), row[0])
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return row
+    
+    def _execute(self, job_id: str, career: str, location: str, claimed: bool = False):
+        if not claimed and not self._claim(job_id):
+            return
+        self._track(job_id)
+        try:
+            result = self.engine.fresh_result(career, location) or self.engine._search_live(career, location)
+            self._finish(job_id, 'done', summary=self._summary(result))
+        except Exception as e:
+            logger.error(f"❌ Error en búsqueda {job_id[:8]}: {e}")
+            self._finish(job_id, 'error', error=str(e))
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+    
+    def _track(self, job_id: str):
+        """Anota un trabajo en curso; el latido de este proceso mantiene vivo su updated_at"""
+        with self._lock:
+            self._running.add(job_id)
+            if self._heartbeat is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._heartbeat = threading.Thread(target=self._beat, name='search-job-heartbeat', daemon=True)
+                self._heartbeat.start()
+    
+    def _beat(self):
+        while True:
+            time.sleep(SEARCH_JOB_HEARTBEAT_SECONDS)
+            with self._lock:
+                running = list(self._running)
+            if not running:
+                continue
+            try:
+                self.db._conn().execute(
+                    f"UPDATE search_jobs SET updated_at = ? WHERE status = 'running' "
+                    f"AND id IN ({','.join('?' * len(running))})",
+                    (time.time(), *running)
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Error renovando trabajos en curso: {str(e)[:50]}")
+    
+    def _finish(self, job_id: str, status: str, summary: Optional[Dict] = None, error: Optional[str] = None):
+        now = time.time()
+        self.db._conn().execute(
+            'UPDATE search_jobs SET status = ?, updated_at = ?, finished_at = ?, summary = ?, error = ? WHERE id = ?',
+            (status, now, now, json.dumps(summary) if summary else None, error, job_id)
+        )
+    
+    @staticmethod
+    def _summary(result: 'SearchResult') -> Dict:
+        return {
+            "total": result.entry.total,
+            "partial": bool(result.timed_out or result.skipped),
+            "timed_out_sources": result.timed_out,
+            "skipped_sources": result.skipped
+        }
+    
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self.db._conn().execute(
+            'SELECT career, location, status, created_at, updated_at, finished_at, summary, error '
+            'FROM search_jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if not row:
+            return None
+        career, location, status, created_at, updated_at, finished_at, summary, error = row
+        if status in ('queued', 'running') and updated_at < time.time() - SEARCH_JOB_STALE_SECONDS:
+            status, error = 'error', 'Trabajo abandonado (el worker que lo corría ya no responde)'
+        
+        job = {
+            "job_id": job_id,
+            "status": status,
+            "query": {"career": career, "location": location_text(location)},
+            "created_at": datetime.fromtimestamp(created_at).isoformat(timespec='seconds'),
+            "finished_at": datetime.fromtimestamp(finished_at).isoformat(timespec='seconds') if finished_at else None,
+        }
+        if error:
+            job["error"] = error
+        if status == 'done':
+            job.update(json.loads(summary))
+        return job
+    
+    def payload(self, job: Dict) -> bytes:
+        """Vacantes de un trabajo terminado, ya serializadas; viven en el caché, no en la cola"""
+        query = job["query"]
+        result = (self.engine._from_cache(query["career"], query["location"])
+                  or self.engine._from_broader(query["career"], query["location"]))
+        return result.entry.payload if result else b'[]'
+    
+    def _cleanup(self, now: float):
+        if now - self._last_cleanup < SEARCH_JOB_RETENTION_SECONDS / 10:
+            return
+        self._last_cleanup = now
+        self.db._conn().execute(
+            'DELETE FROM search_jobs WHERE updated_at < ?', (now - SEARCH_JOB_RETENTION_SECONDS,)
+        )
+    
+    def run_worker(self):
+        """Proceso dedicado (`python app.py worker`): toma trabajos encolados por los workers web"""
+        logger.info(f"🧵 Worker de búsquedas: {SEARCH_JOB_WORKERS} a la vez")
+        slots = threading.Semaphore(SEARCH_JOB_WORKERS)
+        pool = self._executor()
+        
+        def run(job: tuple):
+            try:
+                self._execute(*job, claimed=True)
+            finally:
+                slots.release()
+        
+        while True:
+            slots.acquire()
+            job = self._claim_next()
+            if job is None:
+                slots.release()
+                time.sleep(SEARCH_JOB_POLL_SECONDS)
+                continue
+            logger.info(f"🧵 Trabajo {job[0][:8]}: {job[1]} / {job[2]}")
+            pool.submit(run, job)
+
+search_jobs = SearchJobs(cache, engine)
+
 # ══════════════════════════════════════════════════════════════════════════════
 # RUTAS API
 # ══════════════════════════════════════════════════════════════════════════════
 
+def json_with_payload(fields: Dict, name: str, payload: bytes) -> bytes:
+    """Objeto JSON con `fields` más `name`: payload, incrustado ya serializado"""
+    head = json.dumps(fields)[:-1].encode()
+    return head + b', ' + json.dumps(name).encode() + b': ' + payload + b'}'
+
+def json_response_with_payload(fields: Dict, name: str, payload: bytes, segment=None):
+    """Respuesta JSON que incrusta un payload ya serializado sin volver a codificarlo.
+    
+    Con `segment` (callable que da el deflate del payload, ver `CacheEntry.segment`) y
+    un cliente que acepta gzip, el cuerpo es un solo miembro gzip: el payload va ya
+    comprimido y solo se comprimen el encabezado y el cierre de esta respuesta.
+    """
+    if segment is None or not request.accept_encodings['gzip']:
+        return app.response_class(json_with_payload(fields, name, payload), mimetype='application/json')
+    head = json.dumps(fields)[:-1].encode() + b', ' + json.dumps(name).encode() + b': '
+    body = gzip_member([(head, None), (payload, segment()), (b'}', None)])
+    response = app.response_class(body, mimetype='application/json')
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+JOB_FIELDS = ('title', 'company', 'location', 'link', 'source')
+
+@dataclass(frozen=True)
+class JobView:
+    """Página (`offset`/`limit`) y campos (`fields`) de la lista de vacantes que pide el cliente"""
+    offset: int = 0
+    limit: Optional[int] = None
+    fields: Optional[tuple] = None
+    
+    @classmethod
+    def from_args(cls, args) -> 'JobView':
+        try:
+            offset = max(int(args.get('offset', 0)), 0)
+            limit = max(int(args['limit']), 1) if args.get('limit') else None
+        except ValueError:
+            raise ValueError("'limit' y 'offset' deben ser enteros")
+        fields = None
+        if args.get('fields'):
+            fields = tuple(dict.fromkeys(name.strip() for name in args['fields'].split(',') if name.strip()))
+            unknown = [name for name in fields if name not in JOB_FIELDS]
+            if unknown or not fields:
+                raise ValueError(f"Campos no válidos: {', '.join(unknown)}; disponibles: {', '.join(JOB_FIELDS)}")
+        return cls(offset, limit, fields)
+    
+    @property
+    def full(self) -> bool:
+        """Toda la lista tal cual: se sirve el payload guardado sin tocarlo"""
+        return self.offset == 0 and self.limit is None and self.fields is None
+    
+    @property
+    def tag(self) -> str:
+        if self.full:
+            return ''
+        return '-' + hashlib.blake2b(repr(self).encode(), digest_size=4).hexdigest()
+    
+    def count(self, total: int) -> int:
+        """Vacantes que deja la página de una lista de `total`"""
+        return len(range(total)[self.offset:self.offset + self.limit if self.limit else None])
+    
+    def apply(self, jobs: List[dict]) -> List[dict]:
+        jobs = jobs[self.offset:self.offset + self.limit if self.limit else None]
+        if self.fields:
+            jobs = [{name: job.get(name) for name in self.fields} for job in jobs]
+        return jobs
+
+def cache_control(result: 'SearchResult') -> str:
+    """Vida restante de la entrada: fresca hasta el soft TTL y servible vieja hasta el hard TTL"""
+    entry = result.entry
+    if not entry.total:
+        # Sin vacantes no se guardó en caché: que el cliente vuelva a preguntar
+        return 'no-store'
+    now = time.time()
+    max_age = max(int(entry.stale_at - now), 0)
+    stale = max(int(entry.expires_at - max(entry.stale_at, now)), 0)
+    return f'public, max-age={max_age}, stale-while-revalidate={stale}'
+
+
 @app.route('/')
 def serve_frontend():
     return send_from_directory('static', 'index.html')
@@ -609,6 +3921,12 @@ def api_info():
 
 @app.route('/api/scrape', methods=['GET'])
 def scrape_jobs():
+    """Búsqueda completa (caché o en vivo).
+    
+    Acepta `offset`/`limit` y `fields` (p. ej. title,link). La respuesta lleva un ETag
+    débil de la entrada de caché y la vista pedida: con `If-None-Match` igual se
+    responde 304 sin cuerpo.
+    """
     career = request.args.get('career')
     location = request.args.get('location', 'México')
     
@@ -618,22 +3936,283 @@ def scrape_jobs():
     if career not in CAREER_CONFIG:
         return jsonify({"error": f"Carrera '{career}' no válida"}), 400
     
+    try:
+        view = JobView.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    profile = request.args.get('profile') == '1'
+    location = canonical_location(location).name
+    prewarmer.record(career, location)
+    
     try:
         start = time.time()
-        jobs = engine.search(career, location)
+        with tracing('scrape', career=career, location=location) as trace:
+            result = engine.search(career, location)
         elapsed = round(time.time() - start, 2)
         
-        return jsonify({
-            "success": True,
-            "query": {"career": career, "location": location},
-            "total": len(jobs),
-            "time_seconds": elapsed,
-            "jobs": jobs
-        })
+        entry = result.entry
+        etag = entry.etag + view.tag
+        if not profile and request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            fields = {
+                "success": True,
+                "query": {"career": career, "location": location_text(location)},
+                "total": entry.total,
+                "time_seconds": elapsed,
+                "freshness": result.freshness,
+                "age_seconds": round(result.age_seconds),
+                "partial": bool(result.timed_out or result.skipped),
+                "timed_out_sources": result.timed_out,
+                "skipped_sources": result.skipped
+            }
+            if profile:
+                fields["profile"] = trace.breakdown()
+            
+            # Las vacantes de cada vista se serializan y comprimen una sola vez por entrada
+            tag = view.tag
+            payload = entry.view_payload(tag, lambda: json.dumps(view.apply(entry.data)).encode())
+            if not view.full:
+                fields.update(offset=view.offset, limit=view.limit, count=view.count(entry.total))
+            response = json_response_with_payload(fields, "jobs", payload, lambda: entry.segment(tag, payload))
+        
+        response.set_etag(etag, weak=True)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'no-store' if profile else cache_control(result)
+        return response
+    except SearchTimeout as e:
+        logger.warning(f"⏳ {e}")
+        return jsonify({"error": str(e)}), 504
     except Exception as e:
         logger.error(f"❌ Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/scrape/batch', methods=['POST'])
+def scrape_jobs_batch():
+    """Varias búsquedas en una petición.
+    
+    Cuerpo JSON: {"searches": [{"career": ..., "location": ...}, ...]} o, para todas
+    las carreras en una ubicación, {"careers": [...], "location": ...}. Los resultados
+    vuelven en el mismo orden, uno por par distinto.
+    """
+    params = request.get_json(silent=True) or {}
+    if not isinstance(params, dict):
+        return jsonify({"error": "El cuerpo debe ser un objeto JSON"}), 400
+    if 'searches' in params:
+        searches = params['searches']
+    elif isinstance(params.get('careers') or [], list):
+        searches = [{"career": career, "location": params.get('location', 'México')}
+                    for career in params.get('careers') or []]
+    else:
+        searches = None
+    if not isinstance(searches, list) or not searches:
+        return jsonify({"error": "Se requiere 'searches' o 'careers'"}), 400
+    if len(searches) > BATCH_MAX_SEARCHES:
+        return jsonify({"error": f"Máximo {BATCH_MAX_SEARCHES} búsquedas por lote"}), 400
+    
+    pairs = []
+    for search in searches:
+        career = search.get('career') if isinstance(search, dict) else None
+        if not isinstance(career, str) or career not in CAREER_CONFIG:
+            return jsonify({"error": f"Carrera '{career}' no válida"}), 400
+        location = search.get('location', 'México')
+        if not isinstance(location, str):
+            return jsonify({"error": f"Ubicación '{location}' no válida"}), 400
+        pairs.append((career, canonical_location(location).name))
+    pairs = list(dict.fromkeys(pairs))
+    for career, location in pairs:
+        prewarmer.record(career, location)
+    
+    start = time.time()
+    with tracing('batch', searches=len(pairs)):
+        results = engine.search_many(pairs)
+    
+    items = []
+    for career, location in pairs:
+        result = results[(career, location)]
+        query = {"career": career, "location": location_text(location)}
+        if isinstance(result, Exception):
+            items.append(json.dumps({"success": False, "query": query, "error": str(result)}).encode())
+            continue
+        items.append(json_with_payload({
+            "success": True,
+            "query": query,
+            "total": result.entry.total,
+            "freshness": result.freshness,
+            "age_seconds": round(result.age_seconds),
+            "partial": bool(result.timed_out or result.skipped),
+            "timed_out_sources": result.timed_out,
+            "skipped_sources": result.skipped
+        }, "jobs", result.entry.payload))
+    
+    return json_response_with_payload({
+        "success": True,
+        "searches": len(pairs),
+        "time_seconds": round(time.time() - start, 2)
+    }, "results", b'[' + b', '.join(items) + b']')
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/scrape/stream', methods=['GET'])
+def scrape_jobs_stream():
+    """Server-Sent Events: vacantes de cada fuente conforme llegan, luego un resumen"""
+    career = request.args.get('career')
+    location = request.args.get('location', 'México')
+    
+    if not career:
+        return jsonify({"error": "El parámetro 'career' es requerido"}), 400
+    
+    if career not in CAREER_CONFIG:
+        return jsonify({"error": f"Carrera '{career}' no válida"}), 400
+    
+    location = canonical_location(location).name
+    prewarmer.record(career, location)
+    
+    def generate():
+        start = time.time()
+        try:
+            for event in engine.search_stream(career, location):
+                kind = event[0]
+                if kind == 'keepalive':
+                    yield ": keepalive\n\n"
+                elif kind == 'source':
+                    _, source, jobs = event
+                    yield sse_event('jobs', {"source": source, "jobs": jobs})
+                elif kind == 'result':
+                    result = event[1]
+                    yield sse_event('summary', {
+                        "success": True,
+                        "query": {"career": career, "location": location_text(location)},
+                        "total": result.entry.total,
+                        "time_seconds": round(time.time() - start, 2),
+                        "freshness": result.freshness,
+                        "age_seconds": round(result.age_seconds),
+                        "partial": bool(result.timed_out or result.skipped),
+                        "timed_out_sources": result.timed_out,
+                        "skipped_sources": result.skipped
+                    })
+                elif kind == 'error':
+                    logger.error(f"❌ Error: {event[1]}")
+                    yield sse_event('error', {"error": str(event[1])})
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
+            yield sse_event('error', {"error": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/search-jobs', methods=['POST'])
+def submit_search_job():
+    """Encola una búsqueda y responde de inmediato (202) con el id para consultarla"""
+    params = request.get_json(silent=True) or request.values
+    career = params.get('career')
+    location = params.get('location', 'México')
+    
+    if not career:
+        return jsonify({"error": "El parámetro 'career' es requerido"}), 400
+    
+    if career not in CAREER_CONFIG:
+        return jsonify({"error": f"Carrera '{career}' no válida"}), 400
+    
+    location = canonical_location(location).name
+    prewarmer.record(career, location)
+    
+    job = search_jobs.submit(career, location)
+    job["status_url"] = f"/api/search-jobs/{job['job_id']}"
+    job["stream_url"] = f"/api/search-jobs/{job['job_id']}/events"
+    return jsonify(job), 202, {'Location': job["status_url"]}
+
+@app.route('/api/search-jobs/<job_id>', methods=['GET'])
+def get_search_job(job_id: str):
+    job = search_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    if job["status"] != 'done':
+        return jsonify(job)
+    return json_response_with_payload(job, "jobs", search_jobs.payload(job))
+
+@app.route('/api/search-jobs/<job_id>/events', methods=['GET'])
+def search_job_events(job_id: str):
+    """Server-Sent Events con los cambios de estado del trabajo.
+    
+    Ocupa la conexión hasta que termina; con workers síncronos conviene sondear
+    GET /api/search-jobs/<id> en su lugar.
+    """
+    if search_jobs.get(job_id) is None:
+        return jsonify({"error": "Trabajo no encontrado"}), 404
+    
+    def generate():
+        last_status, last_sent = None, time.time()
+        while True:
+            job = search_jobs.get(job_id)
+            if job is None:
+                yield sse_event('error', {"error": "Trabajo no encontrado"})
+                return
+            if job["status"] == 'done':
+                yield sse_event('done', {**job, "jobs": json.loads(search_jobs.payload(job))})
+                return
+            if job["status"] == 'error':
+                yield sse_event('error', job)
+                return
+            if job["status"] != last_status:
+                last_status, last_sent = job["status"], time.time()
+                yield sse_event('status', job)
+            elif time.time() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                last_sent = time.time()
+                yield ": keepalive\n\n"
+            time.sleep(SEARCH_JOB_POLL_SECONDS)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs', methods=['GET'])
+def search_index():
+    """Búsqueda en el índice local de vacantes, sin scrapear.
+    
+    `since` (ISO 8601 o epoch) deja solo las vacantes nuevas desde ese momento.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({"error": "'limit' y 'offset' deben ser enteros"}), 400
+    
+    since = request.args.get('since')
+    if since:
+        try:
+            since = float(since) if re.fullmatch(r'\d+(\.\d+)?', since) else datetime.fromisoformat(since).timestamp()
+        except ValueError:
+            return jsonify({"error": "'since' debe ser ISO 8601 o epoch"}), 400
+    
+    start = time.time()
+    jobs = job_index.search(
+        q=request.args.get('q', ''),
+        location=request.args.get('location', ''),
+        company=request.args.get('company', ''),
+        source=request.args.get('source', ''),
+        career=request.args.get('career', ''),
+        since=since or None,
+        distinct=request.args.get('distinct', '1') != '0',
+        limit=limit,
+        offset=offset
+    )
+    return jsonify({
+        "success": True,
+        "count": len(jobs),
+        "limit": limit,
+        "offset": offset,
+        "time_ms": round((time.time() - start) * 1000, 1),
+        "jobs": jobs
+    })
+
 @app.route('/api/careers', methods=['GET'])
 def list_careers():
     return jsonify({k: {"keywords": v["keywords"], "icon": v["icon"]} for k, v in CAREER_CONFIG.items()})
@@ -642,10 +4221,21 @@ def list_careers():
 def get_stats():
     return jsonify({
         "cache": cache.stats(),
+        "proxies": proxy_manager.stats(),
+        "hosts": http_client.stats(),
+        "breakers": engine.breaker_stats(),
+        "prewarm": prewarmer.stats(),
+        "index": job_index.stats(),
+        "ranking": {"backend": "numpy" if np is not None else "python", "weights": ranker.weights},
         "sources": ["LinkedIn", "Indeed", "Computrabajo", "OCC Mundial"],
         "version": "5.0"
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas en formato Prometheus, sumadas entre todos los workers"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/health', methods=['GET'])
 def health():
     return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
@@ -658,8 +4248,13 @@ if __name__ == '__main__':
     # Limpiar caché viejo al iniciar
     cache.cleanup()
     
-    # Cargar proxies al iniciar
-    proxy_manager.fetch_proxies()
+    # `python app.py worker`: solo atiende la cola de búsquedas (SEARCH_JOBS_MODE=external)
+    if sys.argv[1:] == ['worker']:
+        proxy_manager.start()
+        search_jobs.run_worker()
+    
+    # Cargar proxies en segundo plano
+    proxy_manager.start()
     
     print(f"""
     ╔═══════════════════════════════════════════════════════════════╗
@@ -0,0 +1,113 @@
+"""
+Benchmark de CacheDB bajo acceso concurrente.
+
+Lanza varios procesos (como los workers de gunicorn), cada uno con varios
+hilos, que mezclan lecturas y escrituras sobre un archivo SQLite temporal.
+Reporta lecturas/s y escrituras/s agregadas.
+
+    python bench/bench_cache.py --processes 2 --threads 8 --seconds 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_jobs(n: int):
+    return [
+        {
+            "title": f"Ingeniero de software {i}",
+            "company": f"Empresa {i % 17}",
+            "location": "Ciudad de México",
+            "link": f"https://example.com/jobs/{i}",
+            "source": "LinkedIn",
+        }
+        for i in range(n)
+    ]
+
+
+def worker(db_path: str, threads: int, seconds: float, write_ratio: float,
+           keys: int, no_l1: bool, out):
+    from app import CacheDB
+
+    db = CacheDB(db_path)
+    if no_l1:
+        db.memory.max_entries = 0
+    jobs = make_jobs(40)
+    counts = {'reads': 0, 'writes': 0}
+    lock = threading.Lock()
+    stop_at = time.time() + seconds
+
+    def loop():
+        reads = writes = 0
+        rnd = random.Random()
+        while time.time() < stop_at:
+            key = ('career', f'location-{rnd.randrange(keys)}')
+            if rnd.random() < write_ratio:
+                db.set(jobs, *key)
+                writes += 1
+            else:
+                db.get_entry(*key)
+                reads += 1
+        with lock:
+            counts['reads'] += reads
+            counts['writes'] += writes
+
+    pool = [threading.Thread(target=loop) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    out.put(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--keys', type=int, default=50)
+    parser.add_argument('--no-l1', action='store_true', help='Desactiva el caché en memoria (mide solo SQLite)')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench_cache.db')
+        os.environ['CACHE_DB_PATH'] = db_path
+        from app import CacheDB
+        seed = CacheDB(db_path)
+        for i in range(args.keys):
+            seed.set(make_jobs(40), 'career', f'location-{i}')
+
+        out = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=worker, args=(
+                db_path, args.threads, args.seconds, args.write_ratio, args.keys, args.no_l1, out))
+            for _ in range(args.processes)
+        ]
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    reads = sum(r['reads'] for r in results)
+    writes = sum(r['writes'] for r in results)
+    print(f"procesos={args.processes} hilos={args.threads} escrituras={args.write_ratio:.0%} "
+          f"L1={'off' if args.no_l1 else 'on'}")
+    print(f"  lecturas/s:   {reads / args.seconds:>10,.0f}")
+    print(f"  escrituras/s: {writes / args.seconds:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
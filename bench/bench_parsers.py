@@ -0,0 +1,95 @@
+"""
+Throughput de parseo de los scrapers contra páginas fixture.
+
+Compara el camino anterior (documento completo con html.parser y selectores
+como texto en cada tarjeta) contra `HTMLScraper.parse` (solo subárboles de
+tarjetas y selectores compilados) con cada backend disponible, y verifica
+que ambos extraigan las mismas vacantes.
+
+    python bench/bench_parsers.py --seconds 2
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+
+def legacy_parse(scraper, html: str, location: str):
+    """El parseo tal como estaba antes de HTMLScraper"""
+    from bs4 import BeautifulSoup
+    from app import JobListing
+
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+    for card in soup.select(scraper.CARD_SELECTOR)[:scraper.MAX_CARDS or None]:
+        title_elem = card.select_one(scraper.TITLE_SELECTOR)
+        title = title_elem.get_text(strip=True) if title_elem else None
+        company_elem = card.select_one(scraper.COMPANY_SELECTOR)
+        company = company_elem.get_text(strip=True) if company_elem else "Empresa confidencial"
+        location_elem = card.select_one(scraper.LOCATION_SELECTOR)
+        job_location = location_elem.get_text(strip=True) if location_elem else location
+        link_elem = card.select_one(scraper.LINK_SELECTOR)
+        link = link_elem.get('href', '') if link_elem else ''
+        if title and link:
+            jobs.append(JobListing(title=title, company=company, location=job_location,
+                                   link=scraper.clean_link(link), source=scraper.SOURCE))
+    return jobs
+
+
+def available_backends():
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        pass
+    return backends
+
+
+def measure(fn, seconds: float) -> float:
+    fn()  # Calentar (compilar selectores, etc.)
+    runs = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        runs += 1
+    return runs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=2.0, help='Tiempo por medición')
+    parser.add_argument('--sources', nargs='*', default=fixtures.SOURCES)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    import app
+
+    print(f"{'fuente':<14}{'modo':<24}{'págs/s':>10}{'MB/s':>10}{'vs legacy':>11}")
+    for source in args.sources:
+        html = fixtures.load(source)
+        scraper = fixtures.scraper_for(source)
+        mb = len(html.encode()) / 1e6
+
+        expected = legacy_parse(scraper, html, 'México')
+        base = measure(lambda: legacy_parse(scraper, html, 'México'), args.seconds)
+        print(f"{source:<14}{'legacy html.parser':<24}{base:>10.1f}{base * mb:>10.1f}{'1.00x':>11}")
+
+        for backend in available_backends():
+            app.PARSER_BACKEND = backend
+            got = scraper.parse(html, 'México')
+            if got != expected:
+                print(f"   ⚠️ {backend}: {len(got)} vacantes vs {len(expected)} en legacy")
+            rate = measure(lambda: scraper.parse(html, 'México'), args.seconds)
+            print(f"{'':<14}{'strainer ' + backend:<24}{rate:>10.1f}{rate * mb:>10.1f}{rate / base:>10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Servidor local que imita LinkedIn, Indeed, Computrabajo y OCC.
+
+Sirve las páginas fixture bajo `/{host}/{ruta}` (el formato que usa
+SmartHTTPClient con UPSTREAM_BASE_URL) con latencia, 429 y fallos
+configurables. Cada página lleva ETag y Last-Modified y responde 304 a
+un GET condicional que coincide (se desactiva con --no-validators).
+
+    python bench/fake_sites.py --port 8900 --latency 0.8 --jitter 0.4 --rate-429 0.05
+    UPSTREAM_BASE_URL=http://127.0.0.1:8900 gunicorn app:app ...
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+HOSTS = {
+    'www.linkedin.com': 'linkedin',
+    'mx.indeed.com': 'indeed',
+    'www.computrabajo.com.mx': 'computrabajo',
+    'www.occ.com.mx': 'occ',
+}
+
+
+@dataclass
+class Behavior:
+    latency: float = 0.5  # Segundos promedio por respuesta
+    jitter: float = 0.3  # ± uniforme alrededor de la latencia
+    rate_429: float = 0.0  # Probabilidad de responder 429
+    retry_after: int = 2  # Valor de Retry-After en los 429
+    fail_rate: float = 0.0  # Probabilidad de 500 o conexión cortada
+    validators: bool = True  # ETag/Last-Modified y 304 a peticiones condicionales
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # El cliente deja de leer a media página a propósito (corte por bytes o tarjetas)
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeSites:
+    def __init__(self, behavior: Behavior, port: int = 0, host: str = '127.0.0.1'):
+        self.behavior = behavior
+        self.pages = {h: fixtures.load(source).encode() for h, source in HOSTS.items()}
+        self.etags = {h: '"%s"' % hashlib.md5(page).hexdigest()[:16] for h, page in self.pages.items()}
+        self.last_modified = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime())
+        self.counts = {'200': 0, '304': 0, '429': 0, '500': 0, 'dropped': 0, '404': 0}
+        self._lock = threading.Lock()
+        self.server = QuietServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _handler(self):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                b = sites.behavior
+                time.sleep(max(0.0, b.latency + random.uniform(-b.jitter, b.jitter)))
+
+                host = self.path.lstrip('/').split('/', 1)[0]
+                page = sites.pages.get(host)
+                roll = random.random()
+                if page is None:
+                    sites.count('404')
+                    return self._send(404, b'not found')
+                if roll < b.rate_429:
+                    sites.count('429')
+                    return self._send(429, b'too many requests', {'Retry-After': str(b.retry_after)})
+                if roll < b.rate_429 + b.fail_rate:
+                    if random.random() < 0.5:
+                        sites.count('dropped')
+                        self.close_connection = True
+                        return
+                    sites.count('500')
+                    return self._send(500, b'error')
+                headers = {'Content-Type': 'text/html; charset=utf-8'}
+                if b.validators:
+                    headers.update({'ETag': sites.etags[host], 'Last-Modified': sites.last_modified})
+                    if self.headers.get('If-None-Match') == sites.etags[host]:
+                        sites.count('304')
+                        return self._send(304, b'', headers)
+                sites.count('200')
+                self._send(200, page, headers)
+
+            def _send(self, status: int, body: bytes, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'FakeSites':
+        threading.Thread(target=self.server.serve_forever, name='fake-sites', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_behavior_args(parser: argparse.ArgumentParser):
+    parser.add_argument('--latency', type=float, default=Behavior.latency)
+    parser.add_argument('--jitter', type=float, default=Behavior.jitter)
+    parser.add_argument('--rate-429', type=float, default=Behavior.rate_429)
+    parser.add_argument('--retry-after', type=int, default=Behavior.retry_after)
+    parser.add_argument('--fail-rate', type=float, default=Behavior.fail_rate)
+    parser.add_argument('--no-validators', dest='validators', action='store_false',
+                        help='Sin ETag/Last-Modified ni respuestas 304')
+
+
+def behavior_from_args(args) -> Behavior:
+    return Behavior(latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                    retry_after=args.retry_after, fail_rate=args.fail_rate, validators=args.validators)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8900)
+    add_behavior_args(parser)
+    args = parser.parse_args()
+
+    sites = FakeSites(behavior_from_args(args), port=args.port)
+    print(f"🧪 Sitios falsos en {sites.base_url} ({', '.join(HOSTS)})")
+    try:
+        sites.server.serve_forever()
+    except KeyboardInterrupt:
+        print(sites.counts)
+
+
+if __name__ == '__main__':
+    main()
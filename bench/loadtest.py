@@ -0,0 +1,164 @@
+"""
+Prueba de carga de punta a punta contra gunicorn y sitios falsos locales.
+
+Para cada combinación de clase y número de workers levanta gunicorn con
+UPSTREAM_BASE_URL apuntando a `fake_sites.py` y un caché vacío, precalienta
+un conjunto de claves "calientes" y genera tráfico a /api/scrape con la
+mezcla de aciertos/fallos de caché pedida. Reporta throughput y latencias
+p50/p95/p99.
+
+    python bench/loadtest.py --worker-classes sync gthread --workers 2 4 \\
+        --concurrency 16 --seconds 30 --hit-ratio 0.8 --latency 0.8 --rate-429 0.02
+"""
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_sites  # noqa: E402
+
+CAREERS = [
+    'mecatronica', 'industrial', 'mecanica', 'tecnologias_computacionales', 'civil',
+    'biotecnologia', 'finanzas', 'administracion', 'transformacion_negocios',
+    'negocios_internacionales', 'mercadotecnia', 'arquitectura', 'derecho',
+]
+HOT_LOCATIONS = ['México', 'Ciudad de México', 'Monterrey', 'Guadalajara']
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def start_gunicorn(worker_class: str, workers: int, threads: int, port: int, env: dict) -> subprocess.Popen:
+    cmd = [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--bind', f'127.0.0.1:{port}',
+        '--timeout', '60',
+        '--workers', str(workers),
+        '--worker-class', worker_class,
+        '--log-level', 'warning',
+    ]
+    if worker_class == 'gthread':
+        cmd += ['--threads', str(threads)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            if requests.get(f'{base}/api/health', timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'gunicorn no arrancó ({worker_class} x{workers})')
+
+
+def run_load(base: str, concurrency: int, seconds: float, hit_ratio: float, hot_keys):
+    results = []  # (latencia, status, freshness)
+    lock = threading.Lock()
+    stop_at = time.time() + seconds
+    cold_counter = iter(range(10**9))
+
+    def client():
+        session = requests.Session()
+        local = []
+        while time.time() < stop_at:
+            if random.random() < hit_ratio:
+                career, location = random.choice(hot_keys)
+            else:
+                with lock:
+                    n = next(cold_counter)
+                career, location = random.choice(CAREERS), f'Ciudad {n}'
+            started = time.perf_counter()
+            try:
+                r = session.get(f'{base}/api/scrape', params={'career': career, 'location': location}, timeout=90)
+                freshness = r.json().get('freshness', '-') if r.ok else '-'
+                local.append((time.perf_counter() - started, r.status_code, freshness))
+            except requests.RequestException:
+                local.append((time.perf_counter() - started, 0, '-'))
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--worker-classes', nargs='+', default=['sync', 'gthread'])
+    parser.add_argument('--workers', nargs='+', type=int, default=[2])
+    parser.add_argument('--threads', type=int, default=8, help='Hilos por worker gthread')
+    parser.add_argument('--concurrency', type=int, default=16, help='Clientes simultáneos')
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--hit-ratio', type=float, default=0.8, help='Fracción de peticiones a claves calientes')
+    parser.add_argument('--hot-keys', type=int, default=20)
+    fake_sites.add_behavior_args(parser)
+    args = parser.parse_args()
+
+    sites = fake_sites.FakeSites(fake_sites.behavior_from_args(args)).start()
+    rnd = random.Random(1)
+    hot_keys = [(rnd.choice(CAREERS), rnd.choice(HOT_LOCATIONS)) for _ in range(args.hot_keys)]
+
+    print(f"🧪 Sitios falsos: {sites.base_url} | latencia {args.latency}s ±{args.jitter} | "
+          f"429 {args.rate_429:.0%} | fallos {args.fail_rate:.0%}")
+    print(f"{'clase':<9}{'workers':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errores':>9}{'live':>7}{'caché':>7}")
+
+    for worker_class in args.worker_classes:
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(os.environ,
+                           UPSTREAM_BASE_URL=sites.base_url,
+                           CACHE_DB_PATH=os.path.join(tmp, 'loadtest_cache.db'),
+                           METRICS_DB_PATH=os.path.join(tmp, 'loadtest_metrics.db'),
+                           INDEX_DB_PATH=os.path.join(tmp, 'loadtest_index.db'),
+                           PREWARM_ENABLED='false')
+                port = free_port()
+                proc = start_gunicorn(worker_class, workers, args.threads, port, env)
+                base = f'http://127.0.0.1:{port}'
+                try:
+                    # Precalentar las claves calientes
+                    for career, location in set(hot_keys):
+                        requests.get(f'{base}/api/scrape', params={'career': career, 'location': location}, timeout=90)
+                    results, elapsed = run_load(base, args.concurrency, args.seconds, args.hit_ratio, hot_keys)
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=30)
+
+            latencies = [r[0] * 1000 for r in results]
+            errors = sum(1 for r in results if r[1] != 200)
+            live = sum(1 for r in results if r[2] == 'live')
+            print(f"{worker_class:<9}{workers:>8}{len(results) / elapsed:>9.1f}"
+                  f"{percentile(latencies, 0.50):>9.0f}{percentile(latencies, 0.95):>9.0f}"
+                  f"{percentile(latencies, 0.99):>9.0f}{errors:>9}{live:>7}{len(results) - live - errors:>7}")
+
+    print(f"\nRespuestas de los sitios falsos: {sites.counts}")
+    sites.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+Microbenchmarks offline de los caminos calientes.
+
+- `<fuente>.scrape`: cada scraper completo contra su página fixture
+  (el cliente HTTP se sustituye por uno que sirve los fixtures); la página
+  cambia en cada corrida, así que siempre se parsea
+- `<fuente>.scrape.unchanged`: la misma página otra vez (hash igual, sin parseo)
+- `dedup+serialize`: eliminación de duplicados y serialización del resultado
+- `rank` / `rank.python`: ranking de 1000 vacantes con numpy y en Python puro;
+  antes se verifica que ambos den el mismo orden (si no, sale con código 1)
+- `cache.get` / `cache.get.l1` / `cache.set`: CacheDB sobre un archivo temporal
+
+Reporta ops/s y memoria asignada por operación (tracemalloc). Con
+`--save` guarda los resultados como baseline y con `--compare` marca
+regresiones respecto a uno guardado (código de salida 1).
+
+    python bench/microbench.py --save bench/baseline.json
+    python bench/microbench.py --compare bench/baseline.json --threshold 0.15
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra una función que prepara el caso y devuelve el callable a medir"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def serve_fixtures(app, changing: bool):
+    """Sustituye el cliente HTTP por uno que responde con las páginas fixture.
+    
+    Con `changing` cada respuesta difiere (un comentario al final), como una
+    página con vacantes nuevas; sin él, la página guardada se reutiliza.
+    """
+    pages = {
+        fixtures.scraper_for(source).BASE_URL.split('//', 1)[1]: fixtures.load(source)
+        for source in fixtures.SOURCES
+    }
+    runs = itertools.count()
+
+    def fetch(url, *args, **kwargs):
+        page = pages.get(app.urlsplit(url).netloc)
+        if page is not None and changing:
+            page += f'<!-- {next(runs)} -->'
+        return app.Fetched(text=page)
+
+    app.http_client.fetch = fetch
+
+
+for _source in fixtures.SOURCES:
+    @benchmark(f'{_source}.scrape')
+    def _setup(app, tmp, source=_source):
+        serve_fixtures(app, changing=True)
+        scraper = fixtures.scraper_for(source)
+        return lambda: scraper.scrape('ingeniero de software', 'Ciudad de México')
+
+    @benchmark(f'{_source}.scrape.unchanged')
+    def _setup_unchanged(app, tmp, source=_source):
+        serve_fixtures(app, changing=False)
+        scraper = fixtures.scraper_for(source)
+        return lambda: scraper.scrape('ingeniero de software', 'Ciudad de México')
+
+
+def sample_listings(app, n: int = 200, dup_ratio: float = 0.3):
+    rnd = random.Random(7)
+    jobs = []
+    for i in range(n):
+        if jobs and rnd.random() < dup_ratio:
+            original = rnd.choice(jobs)
+            jobs.append(app.JobListing(title=original.title, company=original.company,
+                                       location=original.location, link=original.link + '?dup', source='Indeed'))
+            continue
+        jobs.append(app.JobListing(
+            title=f"{rnd.choice(fixtures.TITLES)} {i}",
+            company=rnd.choice(fixtures.COMPANIES),
+            location=rnd.choice(fixtures.LOCATIONS),
+            link=f"https://mx.linkedin.com/jobs/view/{3_800_000_000 + i}",
+            source='LinkedIn',
+        ))
+    return jobs
+
+
+@benchmark('dedup+serialize')
+def _dedup(app, tmp):
+    jobs = sample_listings(app)
+
+    def run():
+        unique = app.SearchEngine._dedupe(jobs, app.NearDuplicates())
+        return app.CacheEntry.from_data([job.to_dict() for job in unique])
+    return run
+
+
+def check_rank_backends(app, jobs):
+    """El ranking vectorizado debe ordenar igual que el de Python puro"""
+    numpy = app.np
+    if numpy is None:
+        print("   ⚠️ rank: sin numpy (o RANK_BACKEND=python), no hay con qué comparar")
+        return
+    for career in app.CAREER_CONFIG:
+        for location in ('México', 'Monterrey', 'Remoto'):
+            vectorized = [job.link for job in app.ranker.rank(jobs, career, location)]
+            app.np = None
+            try:
+                python = [job.link for job in app.ranker.rank(jobs, career, location)]
+            finally:
+                app.np = numpy
+            if vectorized != python:
+                sys.exit(f"❌ rank: numpy y Python puro ordenan distinto ({career} / {location})")
+
+
+@benchmark('rank')
+def _rank(app, tmp):
+    jobs = sample_listings(app, n=1000)
+    check_rank_backends(app, jobs)
+    return lambda: app.ranker.rank(jobs, 'mecatronica', 'Monterrey')
+
+
+@benchmark('rank.python')
+def _rank_python(app, tmp):
+    jobs = sample_listings(app, n=1000)
+
+    def run():
+        numpy, app.np = app.np, None
+        try:
+            return app.ranker.rank(jobs, 'mecatronica', 'Monterrey')
+        finally:
+            app.np = numpy
+    return run
+
+
+def _cache(app, tmp):
+    db = app.CacheDB(os.path.join(tmp, 'microbench.db'))
+    data = [job.to_dict() for job in sample_listings(app, n=40, dup_ratio=0)]
+    for i in range(100):
+        db.set(data, 'career', f'loc-{i}')
+    return db, data
+
+
+@benchmark('cache.get')
+def _cache_get(app, tmp):
+    db, _ = _cache(app, tmp)
+    db.memory = app.MemoryLRU(max_entries=0)  # Solo SQLite + descompresión
+    keys = [('career', f'loc-{i}') for i in range(100)]
+    return lambda: db.get_entry(*random.choice(keys))
+
+
+@benchmark('cache.get.l1')
+def _cache_get_l1(app, tmp):
+    db, _ = _cache(app, tmp)
+    keys = [('career', f'loc-{i}') for i in range(100)]
+    for key in keys:
+        db.get_entry(*key)
+    return lambda: db.get_entry(*random.choice(keys))
+
+
+@benchmark('cache.set')
+def _cache_set(app, tmp):
+    db, data = _cache(app, tmp)
+    return lambda: db.set(data, 'career', f'loc-{random.randrange(100)}')
+
+
+def measure(fn, seconds: float, rounds: int = 3) -> dict:
+    fn()  # Calentar
+    # Mejor de varias rondas: lo más cercano al costo real sin ruido del sistema
+    ops = 0.0
+    for _ in range(rounds):
+        runs = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds / rounds:
+            fn()
+            runs += 1
+        ops = max(ops, runs / (time.perf_counter() - start))
+
+    # Memoria en una corrida aparte: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return {
+        'ops_per_sec': round(ops, 2),
+        'peak_kb': round(peak / 1024, 1),
+        'retained_kb': round(sum(s.size_diff for s in stats) / 1024, 1),
+        'alloc_blocks': sum(max(s.count_diff, 0) for s in stats),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Imprime la comparación; True si hubo alguna regresión"""
+    regressed = False
+    print(f"\n{'benchmark':<30}{'baseline':>12}{'actual':>12}{'cambio':>10}")
+    for name, current in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            print(f"{name:<30}{'-':>12}{current['ops_per_sec']:>12.1f}{'nuevo':>10}")
+            continue
+        change = current['ops_per_sec'] / base['ops_per_sec'] - 1
+        mark = ''
+        if change < -threshold:
+            mark = '  ⚠️ regresión'
+            regressed = True
+        print(f"{name:<30}{base['ops_per_sec']:>12.1f}{current['ops_per_sec']:>12.1f}{change:>+9.0%}{mark}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=2.0, help='Tiempo por benchmark')
+    parser.add_argument('--only', nargs='*', help='Nombres (o prefijos) de benchmarks a correr')
+    parser.add_argument('--save', help='Guarda los resultados como baseline JSON')
+    parser.add_argument('--compare', help='Baseline JSON contra el cual comparar')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Caída de ops/s tolerada antes de marcar regresión')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault('CACHE_DB_PATH', os.path.join(tmp, 'jobscout_cache.db'))
+        os.environ.setdefault('INDEX_DB_PATH', os.path.join(tmp, 'jobscout_index.db'))
+        os.environ.setdefault('METRICS_DB_PATH', os.path.join(tmp, 'jobscout_metrics.db'))
+        import app
+
+        results = {}
+        print(f"{'benchmark':<30}{'ops/s':>12}{'peak KB':>10}{'retenido KB':>13}{'bloques':>9}")
+        for name, setup in BENCHMARKS.items():
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            fn = setup(app, tmp)
+            r = results[name] = measure(fn, args.seconds)
+            print(f"{name:<30}{r['ops_per_sec']:>12.1f}{r['peak_kb']:>10.1f}{r['retained_kb']:>13.1f}{r['alloc_blocks']:>9}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'parser': app.PARSER_BACKEND,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+        print(f"\n💾 Baseline guardado en {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
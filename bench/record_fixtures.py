@@ -0,0 +1,47 @@
+"""
+Graba páginas reales de resultados como fixtures para los benchmarks.
+
+Usa los mismos URLs y cliente HTTP que los scrapers; cada página queda en
+`bench/fixtures/<fuente>.html` y a partir de ahí `fixtures.load()` la
+prefiere sobre la sintética.
+
+    python bench/record_fixtures.py --keyword "desarrollador" --location "México"
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keyword', default='desarrollador')
+    parser.add_argument('--location', default='México')
+    parser.add_argument('--sources', nargs='*', default=fixtures.SOURCES)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    from app import http_client
+
+    os.makedirs(fixtures.FIXTURES_DIR, exist_ok=True)
+    for source in args.sources:
+        scraper = fixtures.scraper_for(source)
+        html = http_client.get(scraper.build_url(args.keyword, args.location))
+        if not html:
+            print(f"❌ {source}: no se pudo descargar")
+            continue
+        jobs = scraper.parse(html, args.location)
+        path = os.path.join(fixtures.FIXTURES_DIR, f'{source}.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f"✅ {source}: {len(html) / 1e3:.0f} KB, {len(jobs)} vacantes -> {path}")
+
+
+if __name__ == '__main__':
+    main()